@@ -2,7 +2,8 @@ from django.contrib import admin
 from .models import Category
 
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'description', 'created_by', 'created_at', 'updated_by', 'updated_at')
+    list_display = ('id', 'name', 'parent', 'active_product_count', 'description', 'created_by', 'created_at', 'updated_by', 'updated_at')
+    readonly_fields = ('path', 'depth', 'active_product_count')
     list_filter = ('created_by', 'updated_by')
     search_fields = ('name', 'description')
     ordering = ('created_at',)
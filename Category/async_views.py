@@ -0,0 +1,14 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from user.authentication import async_login_required
+from .models import Category
+from .serializers import CategorySerializer
+
+
+@require_GET
+@async_login_required
+async def category_list(request):
+    # Async-native counterpart of CategoryViewSet.list
+    categories = [category async for category in Category.objects.order_by('id')]
+    return JsonResponse(CategorySerializer(categories, many=True).data, safe=False)
@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-18 03:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import CharField, Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Concat
+
+
+def backfill(apps, schema_editor):
+    # Every existing category is top level; counts come from the product table
+    Category = apps.get_model('Category', 'Category')
+    Product = apps.get_model('Product', 'Product')
+    counts = (
+        Product.objects.filter(category=OuterRef('pk'), is_active=True)
+        .order_by().values('category').annotate(total=Count('pk')).values('total')
+    )
+    Category.objects.update(
+        path=Concat(Value('/'), Cast('id', output_field=CharField()), Value('/')),
+        depth=0,
+        active_product_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Category', '0002_alter_category_name'),
+        ('Product', '0004_product_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='active_product_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='Category.category'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
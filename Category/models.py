@@ -1,10 +1,25 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
+from Task1 import cache as catalog_cache
 
 
 class Category(models.Model):
     name = models.CharField(max_length=100,unique=True)
 
+    # Optional hierarchy. path is the materialized chain of ids from the root,
+    # e.g. "/1/7/12/", so a whole subtree is one path__startswith lookup.
+    parent = models.ForeignKey('self', on_delete=models.PROTECT, null=True, blank=True, related_name='children')
+
+    path = models.CharField(max_length=255, db_index=True, editable=False, default='')
+
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    # Active products directly in this category, kept up to date by Product.signals
+    active_product_count = models.PositiveIntegerField(default=0, editable=False)
+
     description = models.TextField(blank=True, default=True)
 
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='categories_created', default=True)
@@ -15,7 +30,40 @@ class Category(models.Model):
 
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Name as loaded; Product.signals re-indexes the category's products
+    # only when a save changes it
+    _loaded_name = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_name = instance.__dict__.get('name')
+        return instance
+
+    def clean(self):
+        if self.parent_id and self.pk and (
+            self.parent_id == self.pk or (self.path and self.parent.path.startswith(self.path))
+        ):
+            raise ValidationError({'parent': "A category cannot be placed under itself or its own subcategory."})
+
+    def save(self, *args, **kwargs):
+        old_path = self.path
+        super().save(*args, **kwargs)
+        path = f"{self.parent.path if self.parent_id else '/'}{self.pk}/"
+        if path != old_path:
+            from Category import tree
+            tree.move(self, old_path, path)
+
+    def descendants(self, include_self=False):
+        categories = Category.objects.filter(path__startswith=self.path)
+        return categories if include_self else categories.exclude(pk=self.pk)
+
     def __str__(self):
             return f"{self.name} - {self.description[:30]}... (Created: {self.created_at}, Updated: {self.updated_at})"
 
 
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cache(sender, instance, **kwargs):
+    # Product payloads embed the category name, so drop them as well
+    catalog_cache.invalidate(catalog_cache.CATEGORIES, catalog_cache.PRODUCTS)
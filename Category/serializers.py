@@ -1,8 +1,15 @@
 from rest_framework import serializers
+from Task1.sparse import SparseFieldsetSerializerMixin
 from .models import Category
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
         read_only_fields = ('created_by', 'updated_by')
+
+    def validate_parent(self, parent):
+        category = self.instance
+        if parent is not None and category is not None and category.path and parent.path.startswith(category.path):
+            raise serializers.ValidationError("A category cannot be placed under itself or its own subcategory.")
+        return parent
@@ -1,3 +1,121 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from Product.models import Product
+from user.serializers import ClaimsTokenObtainPairSerializer
+from .models import Category
+
+
+def client_for(user):
+    client = APIClient()
+    token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+class CategoryTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.get_or_create(name='is_admin')
+        Group.objects.get_or_create(name='is_not_admin')
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', is_staff=True)
+        cls.customer = User.objects.create_user('customer', 'customer@example.com', 'pw')
+        cls.root = Category.objects.create(name='Shoes', description='d', created_by=cls.admin, updated_by=cls.admin)
+        cls.child = Category.objects.create(name='Boots', description='d', parent=cls.root, created_by=cls.admin, updated_by=cls.admin)
+        for i in range(10):
+            Category.objects.create(name=f'Category {i}', description='d', created_by=cls.admin, updated_by=cls.admin)
+        for i, category in enumerate([cls.root, cls.child, cls.child]):
+            Product.objects.create(name=f'Product {i}', price=Decimal('5.00'), category=category, created_by=cls.admin)
+        Product.objects.create(name='Hidden', price=Decimal('5.00'), category=cls.child, is_active=False, created_by=cls.admin)
+
+    def setUp(self):
+        # The catalog cache outlives the per-test transaction
+        cache.clear()
+        self.client = client_for(self.customer)
+        self.admin_client = client_for(self.admin)
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class QueryBudgetTests(CategoryTestCase):
+    def test_list_within_budget(self):
+        self.assertEqual(self.client.get('/api/categories/').status_code, 200)
+
+    def test_retrieve_within_budget(self):
+        self.assertEqual(self.client.get(f'/api/categories/{self.root.pk}/').status_code, 200)
+
+
+class CategoryCacheTests(CategoryTestCase):
+    def test_list_shows_new_category(self):
+        count = len(self.client.get('/api/categories/').data)
+        response = self.admin_client.post('/api/categories/', {'name': 'Hats', 'description': 'd'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.client.get('/api/categories/').data), count + 1)
+
+    def test_detail_shows_rename(self):
+        url = f'/api/categories/{self.root.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.root.name = 'Footwear'
+        self.root.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['name'], 'Footwear')
+
+    def test_missing_or_malformed_pk_is_404(self):
+        self.assertEqual(self.client.get('/api/categories/99999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/categories/abc/').status_code, 404)
+
+
+class CategoryTreeTests(CategoryTestCase):
+    def node(self, nodes, pk):
+        return next(node for node in nodes if node['id'] == pk)
+
+    def test_counts_roll_up_to_ancestors(self):
+        root = self.node(self.client.get('/api/categories/tree/').data, self.root.pk)
+        self.assertEqual(root['product_count'], 1)
+        self.assertEqual(root['total_product_count'], 3)
+        self.assertEqual(self.node(root['children'], self.child.pk)['product_count'], 2)
+
+    def test_counts_follow_product_changes(self):
+        self.client.get('/api/categories/tree/')
+        Product.objects.create(name='New', price=Decimal('5.00'), category=self.child, created_by=self.admin)
+        root = self.node(self.client.get('/api/categories/tree/').data, self.root.pk)
+        self.assertEqual(root['total_product_count'], 4)
+
+    def test_counts_follow_moves_and_deactivation(self):
+        product = Product.objects.get(name='Product 0')
+        product.category = self.child
+        product.save()
+        # Neither counted field loaded: the save reads the stored listing
+        hidden = Product.objects.only('name').get(name='Product 1')
+        hidden.is_active = False
+        hidden.save()
+        root = self.node(self.client.get('/api/categories/tree/').data, self.root.pk)
+        self.assertEqual((root['product_count'], root['total_product_count']), (0, 2))
+        self.assertEqual(self.node(root['children'], self.child.pk)['product_count'], 2)
+
+    def test_subtree(self):
+        response = self.client.get(f'/api/categories/tree/?root={self.child.pk}')
+        self.assertEqual([node['id'] for node in response.data], [self.child.pk])
+        self.assertEqual(self.client.get('/api/categories/tree/?root=99999').status_code, 404)
+
+    def test_delete_with_subcategories_is_refused(self):
+        self.assertEqual(self.admin_client.delete(f'/api/categories/{self.root.pk}/').status_code, 409)
+        self.assertTrue(Category.objects.filter(pk=self.root.pk).exists())
+
+
+class AsyncCategoryTests(CategoryTestCase):
+    async def test_list_matches_the_sync_list(self):
+        token = await sync_to_async(ClaimsTokenObtainPairSerializer.get_token)(self.customer)
+        response = await AsyncClient().get('/api/async/categories/', headers={'Authorization': f'Bearer {token.access_token}'})
+        self.assertEqual(response.status_code, 200)
+        sync = await sync_to_async(self.client.get)('/api/categories/')
+        self.assertEqual(response.json(), sync.json())
+
+    async def test_requires_a_token(self):
+        self.assertEqual((await AsyncClient().get('/api/async/categories/')).status_code, 401)
@@ -0,0 +1,93 @@
+"""
+Maintenance of the category hierarchy's materialized paths and per-category
+active product counts, and assembly of the navigation tree.
+
+Counts are adjusted incrementally by the Product signals; bulk writers that
+bypass signals (the catalog importer, benchmark seeding) call ``recount``.
+"""
+from django.db.models import CharField, Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Concat, Substr
+from django.utils import timezone
+
+from .models import Category
+
+
+def move(category, old_path, path):
+    """Store ``category``'s new path and carry its descendants along."""
+    depth = path.count('/') - 2
+    Category.objects.filter(pk=category.pk).update(path=path, depth=depth)
+    if old_path:
+        # One UPDATE re-roots the whole subtree
+        Category.objects.filter(path__startswith=old_path).exclude(pk=category.pk).update(
+            path=Concat(Value(path), Substr('path', len(old_path) + 1)),
+            depth=F('depth') + (depth - category.depth),
+        )
+    category.path, category.depth = path, depth
+
+
+def fill_paths():
+    """Give top-level categories created in bulk (bypassing save) their path."""
+    return Category.objects.filter(path='', parent__isnull=True).update(
+        path=Concat(Value('/'), Cast('id', output_field=CharField()), Value('/')),
+        depth=0,
+    )
+
+
+def adjust(deltas):
+    """Apply {category_id: change in active products}."""
+    now = timezone.now()
+    for category_id, delta in deltas.items():
+        if delta:
+            Category.objects.filter(pk=category_id).update(
+                active_product_count=F('active_product_count') + delta, updated_at=now,
+            )
+
+
+def recount(category_ids=None):
+    """Recompute active product counts with one UPDATE, for all or some categories."""
+    from Product.models import Product
+
+    counts = (
+        Product.objects.filter(category=OuterRef('pk'), is_active=True)
+        .order_by().values('category').annotate(total=Count('pk')).values('total')
+    )
+    categories = Category.objects.all()
+    if category_ids is not None:
+        categories = categories.filter(pk__in=category_ids)
+    return categories.update(
+        active_product_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0),
+        updated_at=timezone.now(),
+    )
+
+
+def build(root=None):
+    """
+    The category tree as nested dicts, from a single query. Each node has
+    its own active product count and the total including its subtree.
+    """
+    categories = Category.objects.order_by('path')
+    if root is not None:
+        categories = categories.filter(path__startswith=root.path)
+    rows = list(categories.values('id', 'name', 'parent_id', 'depth', 'active_product_count'))
+
+    nodes, roots = {}, []
+    for row in rows:
+        node = {
+            'id': row['id'],
+            'name': row['name'],
+            'depth': row['depth'],
+            'product_count': row['active_product_count'],
+            'total_product_count': row['active_product_count'],
+            'children': [],
+        }
+        nodes[row['id']] = node
+        parent = nodes.get(row['parent_id'])
+        (parent['children'] if parent else roots).append(node)
+
+    # Ordered by path, so every node comes after its ancestors: walking
+    # backwards rolls the totals up from the leaves.
+    for row in reversed(rows):
+        parent = nodes.get(row['parent_id'])
+        if parent:
+            parent['total_product_count'] += nodes[row['id']]['total_product_count']
+    return roots
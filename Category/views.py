@@ -1,22 +1,36 @@
 # views.py
 
+from django.db.models import ProtectedError
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from Task1 import cache as catalog_cache
+from Task1.conditional import ConditionalGetMixin
+from Task1.sparse import SparseFieldsetsMixin, SPARSE_PARAMETERS, COMPACT_PARAMETER
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from . import tree as category_tree
 from .models import Category
 from .serializers import CategorySerializer
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(SparseFieldsetsMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     
     queryset = Category.objects.all()  
     serializer_class = CategorySerializer  
     permission_classes = [IsAuthenticated] 
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user, updated_by=self.request.user)
+        serializer.save(created_by_id=self.request.user.pk, updated_by_id=self.request.user.pk)
 
     def perform_update(self, serializer):
-        serializer.save(updated_by=self.request.user)
+        serializer.save(updated_by_id=self.request.user.pk)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            queryset = self.sparse(queryset)
+        return queryset
 
     def get_permissions(self):
         
@@ -24,6 +38,47 @@ class CategoryViewSet(viewsets.ModelViewSet):
             return [IsAdminUser()]  
         return [IsAuthenticated()]  
 
+    @swagger_auto_schema(manual_parameters=SPARSE_PARAMETERS + [COMPACT_PARAMETER])
+    def list(self, request, *args, **kwargs):
+        build = super().list
+
+        def cached():
+            return Response(catalog_cache.cached_payload(
+                catalog_cache.CATEGORIES, request.get_full_path(),
+                lambda: self.shape(build(request, *args, **kwargs).data),
+            ))
+
+        return self.conditional_response(request, self.filter_queryset(self.get_queryset()), cached, many=True)
+
+    @swagger_auto_schema(manual_parameters=SPARSE_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        build = super().retrieve
+
+        def cached():
+            return Response(catalog_cache.cached_payload(
+                catalog_cache.CATEGORIES, request.get_full_path(),
+                lambda: build(request, *args, **kwargs).data,
+            ))
+
+        return self.conditional_response(request, self.object_queryset(self.get_queryset(), kwargs['pk']), cached)
+
+    @swagger_auto_schema(
+        manual_parameters=[openapi.Parameter('root', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description='Only the subtree under this category')],
+        responses={200: openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT))}
+    )
+    @action(detail=False, methods=['get'], url_path='tree')
+    def tree(self, request):
+        # Navigation tree with active product counts, built from one query and cached
+        root = None
+        root_id = request.query_params.get('root')
+        if root_id:
+            root = Category.objects.filter(pk=root_id).first() if root_id.isdigit() else None
+            if root is None:
+                return Response({"detail": "Category not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(catalog_cache.cached_payload(
+            catalog_cache.CATEGORIES, request.get_full_path(), lambda: category_tree.build(root),
+        ))
+
     def create(self, request, *args, **kwargs):
         
         is_many = isinstance(request.data, list)
@@ -43,5 +98,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         
         category = self.get_object()  
-        category.delete()  
+        try:
+            category.delete()
+        except ProtectedError:
+            return Response({"detail": "Category has subcategories; move or delete them first."}, status=status.HTTP_409_CONFLICT)
         return Response(status=status.HTTP_204_NO_CONTENT) 
\ No newline at end of file
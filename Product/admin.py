@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Product
+from . import repricing
+from .models import PriceChange, Product
 
 class ProductAdmin(admin.ModelAdmin):
     list_display = ('product_id', 'name', 'description', 'price', 'category', 'is_active', 'created_by', 'created_at', 'updated_by', 'updated_at')
@@ -13,3 +14,41 @@ class ProductAdmin(admin.ModelAdmin):
     list_per_page = 20
 
 admin.site.register(Product, ProductAdmin)
+
+
+class PriceChangeAdmin(admin.ModelAdmin):
+    list_display = ('id', 'category', 'kind', 'amount', 'effective_at', 'applied_at', 'abandoned_at', 'products_updated', 'created_by')
+
+    list_filter = ('kind', 'applied_at', 'abandoned_at', 'category')
+
+    ordering = ('-effective_at',)
+
+    readonly_fields = ('applied_at', 'abandoned_at', 'products_updated', 'created_by', 'created_at')
+
+    actions = ['abandon']
+
+    @admin.action(description='Abandon selected partly applied price changes')
+    def abandon(self, request, queryset):
+        changes = queryset.filter(applied_at__isnull=True, abandoned_at__isnull=True, last_product_id__gt=0)
+        for change in changes:
+            repricing.abandon(change)
+        self.message_user(request, f"Abandoned {len(changes)} price change(s).")
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
+
+    def has_change_permission(self, request, obj=None):
+        # Editing a change that has (partly) run would not undo it
+        if obj is not None and (obj.applied_at is not None or obj.last_product_id):
+            return False
+        return super().has_change_permission(request, obj)
+
+    def has_delete_permission(self, request, obj=None):
+        # A change that has (partly) run is abandoned instead, keeping its record
+        if obj is not None and (obj.applied_at is not None or obj.last_product_id):
+            return False
+        return super().has_delete_permission(request, obj)
+
+admin.site.register(PriceChange, PriceChangeAdmin)
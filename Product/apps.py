@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProductConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Product'
+
+    def ready(self):
+        import Product.signals  # Keep the search index and category counts in step with the catalog
@@ -0,0 +1,41 @@
+"""
+Async-native read endpoints for the catalog, served alongside the DRF
+viewsets. They use the async ORM so that under ASGI a slow client holds a
+coroutine rather than a worker thread. Data shapes match ProductViewSet.
+"""
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from Task1 import keyset
+from user.authentication import async_login_required
+from .models import Product
+from .serializers import ProductListSerializer, ProductSerializer
+
+
+@require_GET
+@async_login_required
+async def product_list(request):
+    size = keyset.page_size(request)
+    products = Product.objects.select_related('category').order_by('created_at', 'product_id')
+    try:
+        products = keyset.after(products, request.GET.get('cursor'), 'created_at', 'product_id')
+    except keyset.InvalidCursor as e:
+        return JsonResponse({"detail": str(e)}, status=404)
+
+    page = [product async for product in products[:size + 1]]
+    has_next = len(page) > size
+    page = page[:size]
+    return JsonResponse({
+        'next': keyset.next_link(request, page[-1].created_at, page[-1].product_id) if has_next else None,
+        'results': ProductListSerializer(page, many=True).data,
+    })
+
+
+@require_GET
+@async_login_required
+async def product_detail(request, pk):
+    try:
+        product = await Product.objects.aget(pk=pk)
+    except Product.DoesNotExist:
+        return JsonResponse({"detail": "No Product matches the given query."}, status=404)
+    return JsonResponse(ProductSerializer(product).data)
@@ -0,0 +1,211 @@
+"""
+Chunked catalog import from CSV or NDJSON.
+
+Rows are read lazily from the input, validated a chunk at a time and
+upserted with ``bulk_create(update_conflicts=True)``: categories on their
+unique name, products on their SKU. A bad row is reported and skipped
+without aborting the rest of the import.
+"""
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db import DatabaseError, transaction
+
+from Category import tree
+from Category.models import Category
+from Product import search
+from Product.models import Product
+from Task1 import cache as catalog_cache
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+MAX_REPORTED_ERRORS = 1000
+
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'f', 'no', 'n'}
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_rows(lines, fmt):
+    """
+    Yield ``(row_number, row, error)`` for each record of an iterable of text
+    lines. Unparseable NDJSON lines come back with ``row=None``.
+    """
+    if fmt == 'csv':
+        # Row 1 is the header
+        for number, row in enumerate(csv.DictReader(lines), start=2):
+            yield number, row, None
+        return
+
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Expected a JSON object."
+            continue
+        yield number, row, None
+
+
+def _text(row, field, max_length, required=False):
+    value = row.get(field)
+    value = '' if value is None else str(value).strip()
+    if required and not value:
+        raise RowError(f"{field}: this field is required.")
+    if len(value) > max_length:
+        raise RowError(f"{field}: at most {max_length} characters.")
+    return value
+
+
+def _price(row):
+    try:
+        price = Decimal(str(row.get('price', '')).strip())
+    except InvalidOperation:
+        raise RowError("price: a valid number is required.")
+    if not price.is_finite() or price < 0 or price >= Decimal('1e8'):
+        raise RowError("price: must be between 0 and 99999999.99.")
+    return price.quantize(Decimal('0.01'))
+
+
+def _boolean(row, field, default):
+    value = row.get(field)
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise RowError(f"{field}: expected true or false.")
+
+
+class CatalogImporter:
+
+    def __init__(self, user, chunk_size=1000):
+        self.user = user
+        self.chunk_size = chunk_size
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+
+    def result(self):
+        return {
+            'imported': self.imported,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+    def _error(self, row, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'error': message})
+
+    def _run(self, records, build, upsert, finish=None):
+        # Keyed by natural key so a repeated key inside one chunk keeps the
+        # last row; a single upsert statement cannot touch a row twice.
+        chunk = {}
+        first_row = None
+        for number, row, error in records:
+            if error is None:
+                try:
+                    key, obj = build(row)
+                except RowError as e:
+                    error = str(e)
+            if error is not None:
+                self._error(number, error)
+                continue
+
+            first_row = first_row or number
+            chunk[key] = obj
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk, first_row, number, upsert)
+                chunk, first_row = {}, None
+
+        if chunk:
+            self._flush(chunk, first_row, number, upsert)
+        if finish is not None:
+            finish()
+        catalog_cache.invalidate(catalog_cache.CATEGORIES, catalog_cache.PRODUCTS)
+        return self.result()
+
+    def _flush(self, chunk, first_row, last_row, upsert):
+        try:
+            with transaction.atomic():
+                upsert(list(chunk.values()))
+        except DatabaseError as e:
+            self._error(f"{first_row}-{last_row}", f"Chunk rejected by the database: {e}")
+        else:
+            self.imported += len(chunk)
+
+    def import_categories(self, records):
+        def build(row):
+            name = _text(row, 'name', 100, required=True)
+            category = Category(
+                name=name,
+                description=_text(row, 'description', 10000),
+                created_by_id=self.user.pk,
+                updated_by_id=self.user.pk,
+            )
+            return name, category
+
+        def upsert(categories):
+            Category.objects.bulk_create(
+                categories,
+                update_conflicts=True,
+                unique_fields=['name'],
+                update_fields=['description', 'updated_by', 'updated_at'],
+            )
+
+        # bulk_create bypasses Category.save(), which sets the path
+        return self._run(records, build, upsert, finish=tree.fill_paths)
+
+    def import_products(self, records):
+        # Prebuilt once so resolving a row's category never hits the database
+        category_ids = dict(Category.objects.values_list('name', 'id'))
+
+        def build(row):
+            sku = _text(row, 'sku', 64, required=True)
+            category_name = _text(row, 'category', 100, required=True)
+            if category_name not in category_ids:
+                raise RowError(f"category: unknown category {category_name!r}.")
+            product = Product(
+                sku=sku,
+                name=_text(row, 'name', 200, required=True),
+                description=_text(row, 'description', 100000) or None,
+                price=_price(row),
+                is_active=_boolean(row, 'is_active', True),
+                category_id=category_ids[category_name],
+                created_by_id=self.user.pk,
+                updated_by_id=self.user.pk,
+            )
+            return sku, product
+
+        def upsert(products):
+            Product.objects.bulk_create(
+                products,
+                update_conflicts=True,
+                unique_fields=['sku'],
+                update_fields=['name', 'description', 'price', 'is_active', 'category', 'updated_by', 'updated_at'],
+            )
+            # bulk_create skips the post_save receiver that feeds the search index
+            search.index_products(
+                Product.objects.filter(sku__in=[product.sku for product in products]).values_list('pk', flat=True)
+            )
+
+        # Upserts can activate, deactivate or move products: recount once at the end
+        return self._run(records, build, upsert, finish=tree.recount)
+
+    def run(self, kind, records):
+        if kind == 'categories':
+            return self.import_categories(records)
+        return self.import_products(records)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from Product import repricing
+
+
+class Command(BaseCommand):
+    help = "Apply the scheduled price changes that are due. Run it from cron; interrupted runs resume."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=repricing.BATCH_SIZE, help='Products per UPDATE.')
+
+    def handle(self, *args, **options):
+        applied = 0
+        for change, result in repricing.apply_due(batch_size=options['batch_size']):
+            if isinstance(result, repricing.InvalidPriceChange):
+                self.stderr.write(self.style.ERROR(f"Price change #{change.pk} ({change}) refused: {result}"))
+                continue
+            applied += 1
+            self.stdout.write(f"Price change #{change.pk} ({change}): {result} product(s) repriced.")
+        self.stdout.write(self.style.SUCCESS(f"Applied {applied} price change(s)."))
@@ -0,0 +1,38 @@
+import json
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from Product.importer import IMPORT_FORMATS, CatalogImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import categories or products from a CSV or NDJSON file in chunked upserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=['categories', 'products'])
+        parser.add_argument('path', help="Input file, or '-' for stdin.")
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Defaults to the file extension.')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--user', help='Username recorded as created_by/updated_by (default: first superuser).')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson')
+
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.filter(is_superuser=True).order_by('id').first()
+        if user is None:
+            raise CommandError("No user to record the import as; pass --user.")
+
+        importer = CatalogImporter(user, chunk_size=options['chunk_size'])
+        if path == '-':
+            result = importer.run(options['kind'], read_rows(sys.stdin, fmt))
+        else:
+            with open(path, newline='', encoding='utf-8-sig') as lines:
+                result = importer.run(options['kind'], read_rows(lines, fmt))
+
+        self.stdout.write(json.dumps(result, indent=2))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from Product import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the product full-text search index from the catalog."
+
+    def handle(self, *args, **options):
+        if not search.is_enabled():
+            self.stdout.write("Full-text index is only used on SQLite; nothing to rebuild.")
+            return
+        count = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} product(s)."))
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Product = apps.get_model('Product', 'Product')
+    Category = apps.get_model('Category', 'Category')
+    qn = schema_editor.quote_name
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE product_search USING fts5("
+        "name, description, category_name, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    schema_editor.execute(
+        "INSERT INTO product_search(rowid, name, description, category_name) "
+        "SELECT p.product_id, p.name, COALESCE(p.description, ''), c.name "
+        f"FROM {qn(Product._meta.db_table)} p JOIN {qn(Category._meta.db_table)} c ON c.id = p.category_id"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS product_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Category', '0002_alter_category_name'),
+        ('Product', '0003_product_sku'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
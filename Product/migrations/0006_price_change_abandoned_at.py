@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Product', '0005_price_change'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pricechange',
+            name='abandoned_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,10 +1,16 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 from Category.models import Category
+from Task1 import cache as catalog_cache
 
 class Product(models.Model):
     product_id = models.AutoField(primary_key=True)
 
+    # Supplier stock-keeping unit; the natural key used by catalog imports
+    sku = models.CharField(max_length=64, unique=True, null=True, blank=True)
+
     name = models.CharField(max_length=200)
 
     description = models.TextField(blank=True, null=True)
@@ -23,6 +29,73 @@ class Product(models.Model):
     
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Cursor pagination order of the product list
+            models.Index(fields=['created_at', 'product_id'], name='product_created_idx'),
+            # Admin/list filters on category and availability
+            models.Index(fields=['category', 'is_active', 'created_at'], name='product_category_active_idx'),
+            models.Index(fields=['is_active', 'created_at'], name='product_active_created_idx'),
+        ]
+
+    # (category_id, is_active) as loaded, for the category counts kept by
+    # Product.signals. Taken in from_db rather than post_init so products
+    # built in memory pay nothing for it.
+    _listing = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = instance.__dict__
+        if 'category_id' in loaded and 'is_active' in loaded:
+            instance._listing = (loaded['category_id'], loaded['is_active'])
+        return instance
+
+    def __str__(self):
+        return f"{self.name}--{self.description}--{self.is_active}"
+
+
+class PriceChange(models.Model):
+    """
+    A scheduled repricing of the products in a category and its
+    subcategories, or of the whole catalog when category is empty. Applied
+    by Product.repricing once effective_at has passed. last_product_id
+    records progress, so an interrupted run resumes where it stopped
+    instead of repricing some products twice. A change refused part way
+    through can be abandoned, which keeps the products already repriced
+    and stops further runs.
+    """
+    PERCENT = 'percent'
+    ABSOLUTE = 'absolute'
+    KINDS = [
+        (PERCENT, 'Percent'),
+        (ABSOLUTE, 'Absolute'),
+    ]
+
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    kind = models.CharField(max_length=10, choices=KINDS)
+    # Percent: +10 raises prices by 10%. Absolute: -5 takes 5.00 off each price.
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    effective_at = models.DateTimeField()
+    applied_at = models.DateTimeField(null=True, blank=True)
+    abandoned_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_product_id = models.PositiveIntegerField(default=0, editable=False)
+    products_updated = models.PositiveIntegerField(default=0, editable=False)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Pending changes that are due
+            models.Index(fields=['applied_at', 'effective_at'], name='price_change_due_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.name}--{self.description}--{self.is_active}"
\ No newline at end of file
+        unit = '%' if self.kind == self.PERCENT else ''
+        return f"{self.amount:+}{unit} on {self.category or 'all products'} from {self.effective_at}"
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_cache(sender, instance, **kwargs):
+    catalog_cache.invalidate(catalog_cache.PRODUCTS)
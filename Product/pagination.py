@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ProductCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the product list, ordered on (created_at, product_id)
+    so a page is served by a bounded, indexed range scan instead of reading
+    the whole table.
+    """
+    ordering = ('created_at', 'product_id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,140 @@
+"""
+Set-based application of scheduled PriceChange rows.
+
+Each batch is one UPDATE over a primary key range, computing the new price
+in the database, so repricing a category costs a couple of statements per
+thousand products instead of a load and save per product. Every batch
+commits with the change's progress marker, which keeps write locks short
+and lets an interrupted run resume without applying a percentage twice.
+A change that would take any product's price to zero or below, or past the
+column's maximum, is refused as a whole rather than clamped. Orders are
+unaffected: they keep the unit price snapshotted when placed.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, F, Q, Value
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from Category.models import Category
+from Task1 import cache as catalog_cache
+from .models import PriceChange, Product
+
+BATCH_SIZE = 1000
+
+PRICE_FIELD = DecimalField(max_digits=10, decimal_places=2)
+FACTOR_FIELD = DecimalField(max_digits=20, decimal_places=10)
+MAX_PRICE = Decimal('99999999.99')
+
+
+class InvalidPriceChange(Exception):
+    def __init__(self, products):
+        self.products = products
+        super().__init__(f"{products} product(s) would be priced at or below 0.00 or above {MAX_PRICE}.")
+
+
+def new_price(change):
+    """The repriced value of the price column, rounded to cents."""
+    if change.kind == PriceChange.PERCENT:
+        price = F('price') * Value((100 + change.amount) / 100, output_field=FACTOR_FIELD)
+    else:
+        price = F('price') + Value(change.amount, output_field=PRICE_FIELD)
+    return Round(price, 2, output_field=PRICE_FIELD)
+
+
+def out_of_range(change, products):
+    """The products in ``products`` that ``change`` would price out of range."""
+    return products.alias(new_price=new_price(change)).filter(Q(new_price__lte=0) | Q(new_price__gt=MAX_PRICE))
+
+
+def validate(change):
+    """Raise InvalidPriceChange if ``change`` would price any of its products out of range."""
+    products = out_of_range(change, affected(change).filter(pk__gt=change.last_product_id)).count()
+    if products:
+        raise InvalidPriceChange(products)
+
+
+def affected(change):
+    """Products ``change`` applies to: its category's subtree, or the whole catalog."""
+    products = Product.objects.all()
+    if change.category_id is not None:
+        category = Category.objects.only('path').get(pk=change.category_id)
+        products = products.filter(category_id__in=list(category.descendants(include_self=True).values_list('pk', flat=True)))
+    return products
+
+
+def apply(change, batch_size=BATCH_SIZE):
+    """
+    Apply ``change`` batch by batch. Returns the number of products
+    repriced. Raises InvalidPriceChange, before any product is touched, if
+    the change would price a product out of range; each batch is checked
+    again in case prices moved since.
+    """
+    # Progress as stored, in case the caller's copy is stale
+    change = PriceChange.objects.get(pk=change.pk)
+    validate(change)
+    price = new_price(change)
+    products = affected(change)
+
+    while True:
+        with transaction.atomic():
+            # Also serializes two runners working on the same change
+            change = PriceChange.objects.select_for_update().get(pk=change.pk)
+            if change.applied_at is not None or change.abandoned_at is not None:
+                return change.products_updated
+
+            remaining = products.filter(pk__gt=change.last_product_id).order_by('pk')
+            upper = remaining.values_list('pk', flat=True)[batch_size - 1:batch_size].first()
+            batch = remaining if upper is None else remaining.filter(pk__lte=upper)
+            invalid = out_of_range(change, batch).count()
+            if invalid:
+                raise InvalidPriceChange(invalid)
+            updated = batch.update(price=price, updated_at=timezone.now())
+
+            change.products_updated += updated
+            if upper is None:
+                change.applied_at = timezone.now()
+            else:
+                change.last_product_id = upper
+            change.save(update_fields=['last_product_id', 'products_updated', 'applied_at'])
+
+        if updated:
+            catalog_cache.invalidate(catalog_cache.PRODUCTS)
+        if upper is None:
+            return change.products_updated
+
+
+def due(now=None):
+    return PriceChange.objects.filter(
+        applied_at__isnull=True, abandoned_at__isnull=True, effective_at__lte=now or timezone.now(),
+    ).order_by('effective_at', 'pk')
+
+
+def abandon(change):
+    """
+    Stop a partly applied change for good. The products it already
+    repriced keep their new price; products_updated says how many.
+    """
+    with transaction.atomic():
+        change = PriceChange.objects.select_for_update().get(pk=change.pk)
+        if change.applied_at is None and change.abandoned_at is None:
+            change.abandoned_at = timezone.now()
+            change.save(update_fields=['abandoned_at'])
+    return change
+
+
+def apply_due(now=None, batch_size=BATCH_SIZE):
+    """
+    Apply every pending change that is due, oldest first. Returns
+    [(change, products repriced or the InvalidPriceChange that stopped it)];
+    a refused change stays pending until it is deleted or, if some batches
+    already ran, abandoned.
+    """
+    applied = []
+    for change in due(now):
+        try:
+            applied.append((change, apply(change, batch_size)))
+        except InvalidPriceChange as e:
+            applied.append((change, e))
+    return applied
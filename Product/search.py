@@ -0,0 +1,136 @@
+"""
+Full-text product search backed by an SQLite FTS5 table.
+
+``product_search`` holds one row per product (rowid = product_id) with the
+product name, description and category name. It is kept in sync by the
+receivers in Product/signals.py and by the catalog importer, and can be
+rebuilt with ``manage.py rebuild_product_search``. On other databases the
+search falls back to ``icontains`` filters.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from Category.models import Category
+from Product.models import Product
+
+TABLE = 'product_search'
+ID_BATCH = 500
+
+
+def is_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def _select_sql(where):
+    qn = connection.ops.quote_name
+    return (
+        f"INSERT INTO {TABLE}(rowid, name, description, category_name) "
+        f"SELECT p.product_id, p.name, COALESCE(p.description, ''), c.name "
+        f"FROM {qn(Product._meta.db_table)} p JOIN {qn(Category._meta.db_table)} c ON c.id = p.category_id "
+        f"{where}"
+    )
+
+
+def _batches(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), ID_BATCH):
+        yield ids[start:start + ID_BATCH]
+
+
+def index_products(ids):
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        for batch in _batches(ids):
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid IN ({placeholders})", batch)
+            cursor.execute(_select_sql(f"WHERE p.product_id IN ({placeholders})"), batch)
+
+
+def remove_products(ids):
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        for batch in _batches(ids):
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid IN ({placeholders})", batch)
+
+
+def reindex_category(category_id):
+    """Refresh the category name stored with each of the category's products."""
+    index_products(Product.objects.filter(category_id=category_id).values_list('pk', flat=True))
+
+
+def rebuild():
+    if not is_enabled():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        cursor.execute(_select_sql(''))
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+        return cursor.fetchone()[0]
+
+
+def match_expression(query):
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix,
+    so "blu sho" finds "Blue Shoes". Words are quoted so FTS5 operators in
+    user input are treated as plain text.
+    """
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search(query, category=None, min_price=None, max_price=None, is_active=None, limit=20):
+    """Return matching products, best match first."""
+    products = Product.objects.select_related('category')
+
+    if not is_enabled():
+        for word in re.findall(r'\w+', query):
+            products = products.filter(
+                Q(name__icontains=word) | Q(description__icontains=word) | Q(category__name__icontains=word)
+            )
+        if category is not None:
+            products = products.filter(category_id=category)
+        if min_price is not None:
+            products = products.filter(price__gte=min_price)
+        if max_price is not None:
+            products = products.filter(price__lte=max_price)
+        if is_active is not None:
+            products = products.filter(is_active=is_active)
+        return list(products.order_by('name')[:limit])
+
+    expression = match_expression(query)
+    if not expression:
+        return []
+
+    qn = connection.ops.quote_name
+    sql = [
+        f"SELECT s.rowid FROM {TABLE} s JOIN {qn(Product._meta.db_table)} p ON p.product_id = s.rowid",
+        f"WHERE {TABLE} MATCH %s",
+    ]
+    params = [expression]
+    if category is not None:
+        sql.append("AND p.category_id = %s")
+        params.append(category)
+    if min_price is not None:
+        sql.append("AND p.price >= %s")
+        params.append(min_price)
+    if max_price is not None:
+        sql.append("AND p.price <= %s")
+        params.append(max_price)
+    if is_active is not None:
+        sql.append("AND p.is_active = %s")
+        params.append(is_active)
+    # Column weights: name, description, category_name
+    sql.append(f"ORDER BY bm25({TABLE}, 10.0, 1.0, 4.0) LIMIT %s")
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(' '.join(sql), params)
+        ids = [row[0] for row in cursor.fetchall()]
+
+    found = products.in_bulk(ids)
+    return [found[pk] for pk in ids if pk in found]
@@ -1,7 +1,66 @@
 from rest_framework import serializers
-from .models import Product
+from Task1.sparse import SparseFieldsetSerializerMixin
+from . import repricing
+from .models import PriceChange, Product
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = '__all__'
+
+
+class ProductListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    # Read from the joined category row (see ProductViewSet.get_queryset),
+    # so embedding the name costs no extra query per product.
+    category_name = serializers.CharField(source='category.name', read_only=True)
+
+    class Meta:
+        model = Product
+        fields = '__all__'
+
+
+class ProductExportQuerySerializer(serializers.Serializer):
+    output = serializers.ChoiceField(choices=['ndjson', 'csv'], default='ndjson')
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    is_active = serializers.BooleanField(required=False, allow_null=True)
+    category = serializers.IntegerField(required=False)
+
+
+class CatalogImportSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=['categories', 'products'])
+    file = serializers.FileField()
+    input_format = serializers.ChoiceField(choices=['csv', 'ndjson'], required=False)
+
+
+class ProductSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    category = serializers.IntegerField(required=False)
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    is_active = serializers.BooleanField(required=False, allow_null=True)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class PriceChangeSerializer(serializers.ModelSerializer):
+    effective_at = serializers.DateTimeField(required=False, help_text='Defaults to now, which applies the change immediately.')
+
+    class Meta:
+        model = PriceChange
+        fields = [
+            'id', 'category', 'kind', 'amount', 'effective_at', 'applied_at', 'abandoned_at', 'products_updated',
+            'created_by', 'created_at',
+        ]
+        read_only_fields = ['applied_at', 'abandoned_at', 'products_updated', 'created_by', 'created_at']
+
+    def validate(self, attrs):
+        if attrs['kind'] == PriceChange.PERCENT and attrs['amount'] <= -100:
+            raise serializers.ValidationError({'amount': "A percentage cut must be less than 100."})
+        if attrs['amount'] == 0:
+            raise serializers.ValidationError({'amount': "Amount must not be zero."})
+        # Checked against today's prices; apply() checks again when it runs
+        try:
+            repricing.validate(PriceChange(**attrs))
+        except repricing.InvalidPriceChange as e:
+            raise serializers.ValidationError({'amount': [str(e)]})
+        return attrs
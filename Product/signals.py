@@ -0,0 +1,70 @@
+from collections import defaultdict
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from Category import tree
+from Category.models import Category
+from Product import search
+from Product.models import Product
+from Task1 import cache as catalog_cache
+
+LISTING_ATTNAMES = {'category_id', 'is_active'}
+
+
+def listing(product):
+    """(category_id, is_active), or None when either was not loaded."""
+    if not product.pk or product.get_deferred_fields() & LISTING_ATTNAMES:
+        return None
+    return product.category_id, product.is_active
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, **kwargs):
+    search.index_products([instance.pk])
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    search.remove_products([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_products(sender, instance, created, **kwargs):
+    # The category name is the only part of it in the products' index rows
+    if not created and instance.name != instance._loaded_name:
+        search.reindex_category(instance.pk)
+    instance._loaded_name = instance.name
+
+
+@receiver(pre_save, sender=Product)
+def load_listing(sender, instance, **kwargs):
+    # Product.from_db only remembers the listing when both fields were loaded
+    if instance.pk and instance._listing is None and not instance._state.adding:
+        stored = Product.objects.filter(pk=instance.pk).only('category', 'is_active').first()
+        instance._listing = stored and listing(stored)
+
+
+@receiver(post_save, sender=Product)
+def count_active_product(sender, instance, created, **kwargs):
+    current = (instance.category_id, instance.is_active)
+    previous = None if created else instance._listing
+    if current == previous:
+        return
+
+    deltas = defaultdict(int)
+    if previous and previous[1]:
+        deltas[previous[0]] -= 1
+    if current[1]:
+        deltas[current[0]] += 1
+    if any(deltas.values()):
+        tree.adjust(deltas)
+        catalog_cache.invalidate(catalog_cache.CATEGORIES)
+    instance._listing = current
+
+
+@receiver(post_delete, sender=Product)
+def uncount_active_product(sender, instance, **kwargs):
+    if instance._listing and instance._listing[1]:
+        tree.adjust({instance._listing[0]: -1})
+        catalog_cache.invalidate(catalog_cache.CATEGORIES)
@@ -1,3 +1,237 @@
-from django.test import TestCase
+import time
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from Category.models import Category
+from user.serializers import ClaimsTokenObtainPairSerializer
+from . import repricing, search
+from .models import PriceChange, Product
+
+
+def client_for(user):
+    client = APIClient()
+    token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def bearer(user):
+    return {'Authorization': f'Bearer {ClaimsTokenObtainPairSerializer.get_token(user).access_token}'}
+
+
+class ProductTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.get_or_create(name='is_admin')
+        Group.objects.get_or_create(name='is_not_admin')
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', is_staff=True)
+        cls.customer = User.objects.create_user('customer', 'customer@example.com', 'pw')
+        cls.root = Category.objects.create(name='Shoes', description='d', created_by=cls.admin, updated_by=cls.admin)
+        cls.child = Category.objects.create(name='Boots', description='d', parent=cls.root, created_by=cls.admin, updated_by=cls.admin)
+        cls.other = Category.objects.create(name='Books', description='d', created_by=cls.admin, updated_by=cls.admin)
+        categories = [cls.root, cls.child, cls.other]
+        cls.products = [
+            Product.objects.create(
+                name=f'Product {i}', description='d', price=Decimal('10.00') + i,
+                category=categories[i % 3], created_by=cls.admin, updated_by=cls.admin,
+            )
+            for i in range(25)
+        ]
+
+    def setUp(self):
+        # The catalog cache outlives the per-test transaction
+        cache.clear()
+        self.client = client_for(self.customer)
+        self.admin_client = client_for(self.admin)
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class QueryBudgetTests(ProductTestCase):
+    def test_list_within_budget(self):
+        self.assertEqual(self.client.get('/api/products/?page_size=100').status_code, 200)
+
+    def test_retrieve_within_budget(self):
+        self.assertEqual(self.client.get(f'/api/products/{self.products[0].pk}/').status_code, 200)
+
+    def test_search_within_budget(self):
+        self.assertEqual(self.client.get('/api/products/search/?q=product').status_code, 200)
+
+
+class ProductListTests(ProductTestCase):
+    def test_cursor_pages_cover_every_product_once(self):
+        seen = []
+        url = '/api/products/?page_size=10'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [row['product_id'] for row in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, [product.pk for product in self.products])
+
+    def test_list_shows_category_rename(self):
+        self.client.get('/api/products/')
+        self.root.name = 'Footwear'
+        self.root.save()
+        names = {row['product_id']: row['category_name'] for row in self.client.get('/api/products/?page_size=100').data['results']}
+        self.assertEqual(names[self.products[0].pk], 'Footwear')
+
+    def test_list_etag_changes_with_category(self):
+        etag = self.client.get('/api/products/')['ETag']
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.root.name = 'Footwear'
+        self.root.save()
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+    def test_list_ignores_if_modified_since(self):
+        response = self.client.get('/api/products/')
+        self.assertNotIn('Last-Modified', response)
+        # A create in the same second does not move a one-second Last-Modified
+        since = http_date(time.time() + 60)
+        Product.objects.create(name='New', price=Decimal('1.00'), category=self.root, created_by=self.admin)
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+        Product.objects.filter(name='New').delete()
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+
+class ProductSearchTests(ProductTestCase):
+    def ids(self, q):
+        return {row['product_id'] for row in self.client.get(f'/api/products/search/?q={q}').data}
+
+    def test_category_rename_reaches_the_index(self):
+        self.assertEqual(self.ids('footwear'), set())
+        self.root.name = 'Footwear'
+        self.root.save()
+        self.assertEqual(self.ids('footwear'), {product.pk for product in self.products if product.category_id == self.root.pk})
+
+    def test_category_save_without_rename_skips_reindex(self):
+        with mock.patch.object(search, 'reindex_category') as reindex:
+            category = Category.objects.get(pk=self.other.pk)
+            category.description = 'new'
+            category.save()
+        reindex.assert_not_called()
+
+
+class ProductDetailTests(ProductTestCase):
+    def test_detail_shows_update(self):
+        product = self.products[0]
+        self.assertEqual(self.client.get(f'/api/products/{product.pk}/').data['name'], 'Product 0')
+        product.name = 'Renamed'
+        product.save()
+        self.assertEqual(self.client.get(f'/api/products/{product.pk}/').data['name'], 'Renamed')
+
+    def test_detail_not_modified(self):
+        url = f'/api/products/{self.products[0].pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_missing_or_malformed_pk_is_404(self):
+        self.assertEqual(self.client.get('/api/products/99999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/products/abc/').status_code, 404)
+
+
+class RepricingTests(ProductTestCase):
+    def prices(self):
+        return dict(Product.objects.values_list('pk', 'price'))
+
+    def test_percent_change_covers_category_subtree(self):
+        before = self.prices()
+        change = PriceChange.objects.create(category=self.root, kind='percent', amount=Decimal('10'), effective_at=timezone.now())
+        repricing.apply(change, batch_size=4)
+        after = self.prices()
+        for product in self.products:
+            if product.category_id == self.other.pk:
+                self.assertEqual(after[product.pk], before[product.pk])
+            else:
+                self.assertEqual(after[product.pk], (before[product.pk] * Decimal('1.1')).quantize(Decimal('0.01')))
+        change.refresh_from_db()
+        self.assertIsNotNone(change.applied_at)
+
+    def test_resumes_after_last_product(self):
+        before = self.prices()
+        done = self.products[9].pk
+        change = PriceChange.objects.create(kind='absolute', amount=Decimal('-1'), effective_at=timezone.now(), last_product_id=done)
+        repricing.apply(change, batch_size=7)
+        after = self.prices()
+        for pk, price in before.items():
+            self.assertEqual(after[pk], price - 1 if pk > done else price)
+
+    def test_out_of_range_change_is_refused(self):
+        before = self.prices()
+        change = PriceChange.objects.create(kind='absolute', amount=Decimal('-15'), effective_at=timezone.now())
+        with self.assertRaises(repricing.InvalidPriceChange):
+            repricing.apply(change)
+        self.assertEqual(self.prices(), before)
+
+    def test_api_refuses_out_of_range_change(self):
+        response = self.admin_client.post('/api/products/price-changes/', {'kind': 'absolute', 'amount': '-15'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PriceChange.objects.exists())
+
+    def test_change_refused_part_way_can_be_abandoned(self):
+        last = self.products[-1]
+        change = PriceChange.objects.create(kind='absolute', amount=Decimal('-5'), effective_at=timezone.now())
+        # Priced out of range after the up-front check, as if edited mid-run
+        Product.objects.filter(pk=last.pk).update(price=Decimal('1.00'))
+        with mock.patch.object(repricing, 'validate'), self.assertRaises(repricing.InvalidPriceChange):
+            repricing.apply(change, batch_size=4)
+        change.refresh_from_db()
+        self.assertEqual(change.products_updated, 24)
+
+        response = self.admin_client.delete(f'/api/products/price-changes/{change.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.data['abandoned_at'])
+        self.assertEqual(repricing.apply_due(), [])
+        self.assertEqual(Product.objects.get(pk=self.products[0].pk).price, Decimal('5.00'))
+        self.assertEqual(Product.objects.get(pk=last.pk).price, Decimal('1.00'))
+
+    def test_api_applies_due_change_and_refreshes_list(self):
+        product = self.products[2]
+        self.client.get('/api/products/')
+        response = self.admin_client.post(
+            '/api/products/price-changes/', {'category': self.other.pk, 'kind': 'absolute', 'amount': '1.50'}, format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        prices = {row['product_id']: row['price'] for row in self.client.get('/api/products/?page_size=100').data['results']}
+        self.assertEqual(Decimal(prices[product.pk]), product.price + Decimal('1.50'))
+
+
+class AsyncProductTests(ProductTestCase):
+    def setUp(self):
+        super().setUp()
+        self.async_client = AsyncClient()
+        self.auth = bearer(self.customer)
+
+    async def test_requires_a_valid_token(self):
+        self.assertEqual((await self.async_client.get('/api/async/products/')).status_code, 401)
+        response = await self.async_client.get('/api/async/products/', headers={'Authorization': 'Bearer not-a-token'})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_pages_match_the_sync_list(self):
+        seen = []
+        url = '/api/async/products/?page_size=10'
+        while url:
+            response = await self.async_client.get(url, headers=self.auth)
+            self.assertEqual(response.status_code, 200)
+            seen += response.json()['results']
+            url = response.json()['next']
+        sync = await sync_to_async(self.client.get)('/api/products/?page_size=100')
+        self.assertEqual(seen, sync.json()['results'])
+
+    async def test_bad_cursor_is_404(self):
+        response = await self.async_client.get('/api/async/products/?cursor=not-a-cursor', headers=self.auth)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_detail(self):
+        url = f'/api/async/products/{self.products[0].pk}/'
+        self.assertEqual((await self.async_client.get(url, headers=self.auth)).json()['name'], 'Product 0')
+        self.assertEqual((await self.async_client.get('/api/async/products/99999/', headers=self.auth)).status_code, 404)
+        self.assertEqual((await self.async_client.post(url, headers=self.auth)).status_code, 405)
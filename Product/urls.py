@@ -1,8 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProductViewSet
+from .views import PriceChangeViewSet, ProductViewSet
 
 router = DefaultRouter()
+# Registered first so 'price-changes/' is not taken for a product id
+router.register(r'price-changes', PriceChangeViewSet, basename='price-change')
 router.register(r'', ProductViewSet, basename='product')
 
 urlpatterns = [
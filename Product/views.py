@@ -1,13 +1,58 @@
+import codecs
+
+from django.utils import timezone
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from .models import Product
-from .serializers import ProductSerializer
+from drf_yasg.utils import no_body, swagger_auto_schema
+from Task1 import cache as catalog_cache
+from Task1.conditional import ConditionalGetMixin
+from Task1.lean import LeanSerializer
+from Task1.sparse import SparseFieldsetsMixin, SPARSE_PARAMETERS, COMPACT_PARAMETER
+from Task1.streaming import created_between, stream_export
+from . import repricing, search as catalog_search
+from .importer import CatalogImporter, read_rows
+from .models import PriceChange, Product
+from .pagination import ProductCursorPagination
+from .serializers import (
+    ProductSerializer, ProductListSerializer, ProductExportQuerySerializer, CatalogImportSerializer,
+    ProductSearchQuerySerializer, PriceChangeSerializer,
+)
+
+PRODUCT_EXPORT_COLUMNS = [
+    ('product_id', 'product_id'),
+    ('name', 'name'),
+    ('description', 'description'),
+    ('price', 'price'),
+    ('is_active', 'is_active'),
+    ('category', 'category_id'),
+    ('category_name', 'category__name'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+]
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(SparseFieldsetsMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [IsAuthenticated]  
+    pagination_class = ProductCursorPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Join the category so ProductListSerializer can embed its name
+            queryset = queryset.select_related('category')
+        if self.action in ('list', 'retrieve'):
+            queryset = self.sparse(queryset)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ProductListSerializer
+        return super().get_serializer_class()
+
     def get_permissions(self):
         """
         Modify permissions based on action:
@@ -26,11 +71,40 @@ class ProductViewSet(viewsets.ModelViewSet):
         self.perform_create(serializer)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    # GET (list)
+    @swagger_auto_schema(manual_parameters=SPARSE_PARAMETERS + [COMPACT_PARAMETER])
+    def list(self, request, *args, **kwargs):
+        fallback = super().list
+
+        def build():
+            # Serialize straight from .values() rows: same output, no model instances
+            lean = LeanSerializer(self.get_serializer())
+            if not lean.supported:
+                return fallback(request, *args, **kwargs).data
+            queryset = lean.values(self.filter_queryset(self.get_queryset()), keep=self.paginator.ordering)
+            page = self.paginate_queryset(queryset)
+            return self.get_paginated_response(lean.to_representation(page)).data
+
+        def cached():
+            return Response(catalog_cache.cached_payload(
+                catalog_cache.PRODUCTS, request.get_full_path(), lambda: self.shape(build()),
+            ))
+
+        # The list embeds category names, so a renamed category is a change too
+        return self.conditional_response(request, self.filter_queryset(self.get_queryset()), cached, related=['category'], many=True)
+
     # GET
+    @swagger_auto_schema(manual_parameters=SPARSE_PARAMETERS)
     def retrieve(self, request, pk=None):
-        product = self.get_object()
-        serializer = self.get_serializer(product)
-        return Response(serializer.data)
+        def build():
+            product = self.get_object()
+            serializer = self.get_serializer(product)
+            return serializer.data
+
+        def cached():
+            return Response(catalog_cache.cached_payload(catalog_cache.PRODUCTS, request.get_full_path(), build))
+
+        return self.conditional_response(request, self.object_queryset(self.get_queryset(), pk), cached)
 
     # PUT: Full update 
     def update(self, request, pk=None):
@@ -45,3 +119,94 @@ class ProductViewSet(viewsets.ModelViewSet):
         product = self.get_object()
         product.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    # GET: ranked full-text search with prefix matching
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        params = ProductSearchQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        filters = params.validated_data
+
+        products = catalog_search.search(
+            filters['q'],
+            category=filters.get('category'),
+            min_price=filters.get('min_price'),
+            max_price=filters.get('max_price'),
+            is_active=filters.get('is_active'),
+            limit=filters['limit'],
+        )
+        return Response(ProductListSerializer(products, many=True).data)
+
+    # GET: streamed CSV/NDJSON dump of the catalog
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsAdminUser])
+    def export(self, request):
+        params = ProductExportQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        filters = params.validated_data
+
+        products = created_between(Product.objects.order_by('product_id'), filters.get('start'), filters.get('end'))
+        if filters.get('is_active') is not None:
+            products = products.filter(is_active=filters['is_active'])
+        if 'category' in filters:
+            products = products.filter(category_id=filters['category'])
+        return stream_export(products, PRODUCT_EXPORT_COLUMNS, filters['output'], 'products')
+
+    # POST: bulk upsert of categories or products from an uploaded CSV/NDJSON file
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsAdminUser], parser_classes=[MultiPartParser])
+    def import_catalog(self, request):
+        serializer = CatalogImportSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        upload = serializer.validated_data['file']
+        fmt = serializer.validated_data.get('input_format') or ('csv' if upload.name.endswith('.csv') else 'ndjson')
+
+        # Decode the upload line by line instead of reading it into memory
+        lines = codecs.iterdecode(upload, 'utf-8-sig')
+        importer = CatalogImporter(request.user)
+        result = importer.run(serializer.validated_data['kind'], read_rows(lines, fmt))
+        return Response(result)
+
+
+class PriceChangeViewSet(viewsets.ModelViewSet):
+    queryset = PriceChange.objects.order_by('-effective_at', '-id')
+    serializer_class = PriceChangeSerializer
+    permission_classes = [IsAdminUser]
+    # A scheduled change is replaced by deleting it and creating another
+    http_method_names = ['get', 'post', 'delete', 'head', 'options']
+
+    # POST: schedule a change; one that is already effective is applied right away
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        effective_at = serializer.validated_data.get('effective_at') or timezone.now()
+        change = serializer.save(created_by_id=request.user.pk, effective_at=effective_at)
+        if change.effective_at <= timezone.now():
+            try:
+                repricing.apply(change)
+            except repricing.InvalidPriceChange as e:
+                # Prices moved between validation and the run; nothing was repriced
+                return Response({"detail": str(e), "id": change.pk}, status=status.HTTP_409_CONFLICT)
+            change.refresh_from_db()
+        return Response(self.get_serializer(change).data, status=status.HTTP_201_CREATED)
+
+    # DELETE: removes a change nothing has been repriced by yet; one that
+    # stopped part way is abandoned instead, so its record stays
+    def destroy(self, request, pk=None):
+        change = self.get_object()
+        if change.applied_at is not None:
+            return Response({"detail": "Price change has already been applied."}, status=status.HTTP_409_CONFLICT)
+        if change.last_product_id:
+            change = repricing.abandon(change)
+            return Response(self.get_serializer(change).data)
+        change.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    # POST: apply every scheduled change that is due (what apply_price_changes runs)
+    @swagger_auto_schema(request_body=no_body, responses={200: PriceChangeSerializer(many=True)})
+    @action(detail=False, methods=['post'], url_path='apply-due')
+    def apply_due(self, request):
+        applied = [change.pk for change, result in repricing.apply_due() if not isinstance(result, Exception)]
+        changes = PriceChange.objects.filter(pk__in=applied).order_by('effective_at', 'id')
+        return Response(self.get_serializer(changes, many=True).data)
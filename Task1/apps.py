@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class Task1Config(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'Task1'
+
+    def ready(self):
+        # Serializer timing patches DRF process-wide, so do it once here and
+        # only when the metrics middleware that reads it is installed
+        from Task1.metrics import RequestMetricsMiddleware, install_serializer_timer
+        middleware_path = f'{RequestMetricsMiddleware.__module__}.{RequestMetricsMiddleware.__qualname__}'
+        if middleware_path in settings.MIDDLEWARE:
+            install_serializer_timer()
@@ -0,0 +1,212 @@
+"""
+Helpers shared by the benchmark management commands: a throwaway database,
+bulk seeding, and a thread-pool driver that records latency and query
+counts per request.
+"""
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+
+from Category import tree as category_tree
+from Category.models import Category
+from Product import search
+from Product.models import Product
+from Task1 import cache as catalog_cache
+from order import rollups
+from order.models import Order
+
+BENCH_PASSWORD = 'bench-Passw0rd!'
+
+
+@contextmanager
+def temporary_database(verbosity=0):
+    """
+    Run against a scratch copy of the default database, created from the
+    migrations and dropped afterwards, so a benchmark never touches real
+    data. SQLite gets a file rather than the usual in-memory test database
+    so that worker threads share it the way separate processes would.
+    """
+    setup_test_environment()
+    tmpdir = real_path = None
+    if connection.vendor == 'sqlite':
+        tmpdir = tempfile.mkdtemp(prefix='bench-')
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tmpdir, 'bench.sqlite3')
+        if not connection.is_in_memory_db() and not os.path.exists(connection.settings_dict['NAME']):
+            real_path = str(connection.settings_dict['NAME'])
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        # Close every connection while NAME still points at the scratch
+        # database; one reopened after the swap back would be to real data.
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        # sqlite3 creates a missing file on connect: never leave one behind
+        if real_path and os.path.exists(real_path) and not os.path.getsize(real_path):
+            os.remove(real_path)
+
+
+def seed(users=50, categories=20, products=2000, orders=5000, seed_value=1):
+    """Bulk-insert a reproducible data set. Returns (admin, users, products)."""
+    rng = random.Random(seed_value)
+    Group.objects.get_or_create(name='is_admin')
+    customer_group, _ = Group.objects.get_or_create(name='is_not_admin')
+
+    # Hash once and share it: hashing per user would dominate seeding time
+    password = make_password(BENCH_PASSWORD)
+    # Created one by one so user.models.assign_group adds it to is_admin
+    admin = User.objects.create(username='bench-admin', password=password, is_staff=True, is_superuser=True)
+    User.objects.bulk_create(
+        User(username=f'bench-user-{i}', email=f'bench-user-{i}@example.com', password=password)
+        for i in range(users)
+    )
+    customers = list(User.objects.filter(username__startswith='bench-user-').order_by('id'))
+    User.groups.through.objects.bulk_create(
+        User.groups.through(user_id=user.id, group_id=customer_group.id) for user in customers
+    )
+
+    Category.objects.bulk_create(
+        Category(name=f'Category {i}', description=f'Bench category {i}', created_by=admin, updated_by=admin)
+        for i in range(categories)
+    )
+    category_ids = list(Category.objects.values_list('id', flat=True))
+
+    Product.objects.bulk_create(
+        (Product(
+            name=f'Product {i}',
+            description=f'Bench product {i} ' + 'lorem ipsum ' * rng.randint(1, 20),
+            price=Decimal(rng.randint(100, 100000)) / 100,
+            is_active=rng.random() > 0.1,
+            category_id=rng.choice(category_ids),
+            created_by=admin,
+            updated_by=admin,
+        ) for i in range(products)),
+        batch_size=1000,
+    )
+    catalog = list(Product.objects.order_by('pk'))
+
+    def order(i):
+        product = rng.choice(catalog)
+        quantity = rng.randint(1, 5)
+        return Order(
+            user=rng.choice(customers),
+            product=product,
+            category_id=product.category_id,
+            quantity=quantity,
+            unit_price=product.price,
+            total_price=product.price * quantity,
+            order_status=rng.choice(Order.ORDER_STATUS)[0],
+        )
+
+    Order.objects.bulk_create((order(i) for i in range(orders)), batch_size=1000)
+
+    # bulk_create skips the signals and save() logic that maintain these
+    category_tree.fill_paths()
+    category_tree.recount()
+    rollups.rebuild()
+    search.rebuild()
+    catalog_cache.invalidate(catalog_cache.CATEGORIES, catalog_cache.PRODUCTS)
+    return admin, customers, catalog
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    rank = max(int(round(pct / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def summarize(latencies, queries, errors, elapsed, concurrency):
+    latencies = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3) if seconds is not None else None
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 4),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'p50': ms(percentile(latencies, 50)),
+            'p95': ms(percentile(latencies, 95)),
+            'p99': ms(percentile(latencies, 99)),
+            'mean': ms(statistics.fmean(latencies)) if latencies else None,
+            'max': ms(latencies[-1]) if latencies else None,
+        },
+        'queries': {
+            'mean': round(statistics.fmean(queries), 2) if queries else None,
+            'max': max(queries) if queries else None,
+        },
+    }
+
+
+def run_concurrently(task, count, concurrency, make_state=None, offset=0):
+    """
+    Call ``task(state, i)`` for i in range(offset, offset + count) from
+    ``concurrency`` threads.
+    ``task`` returns True on success. Each thread gets its own ``state``
+    (``make_state()``, e.g. a test client) and its own DB connection, which
+    is closed before returning.
+    """
+    local = threading.local()
+    lock = threading.Lock()
+    latencies, queries = [], []
+    errors = [0]
+
+    def call(i):
+        if not hasattr(local, 'state'):
+            local.state = make_state() if make_state else None
+        with CaptureQueriesContext(connections['default']) as captured:
+            start = time.perf_counter()
+            try:
+                ok = task(local.state, i)
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            queries.append(len(captured))
+            if not ok:
+                errors[0] += 1
+
+    # Every pool thread waits here once, so each one closes its connection
+    barrier = threading.Barrier(concurrency)
+
+    def close_connection(_):
+        barrier.wait()
+        connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        list(pool.map(call, range(offset, offset + count)))
+        elapsed = time.perf_counter() - start
+        list(pool.map(close_connection, range(concurrency)))
+
+    return summarize(latencies, queries, errors[0], elapsed, concurrency)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,92 @@
+"""
+Read-through cache for catalog payloads (category and product list/detail).
+
+Entries are grouped in namespaces. Every namespace has a version number kept
+in the cache and baked into each key, so bumping the version invalidates all
+of the namespace's entries at once, including list pages keyed by query
+string that we never track individually.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+CATEGORIES = 'categories'
+PRODUCTS = 'products'
+
+_MISSING = object()
+
+
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def _version_key(namespace):
+    return f'catalog:{namespace}:version'
+
+
+def _namespace_version(cache, namespace):
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Seed with a timestamp rather than 1 so an evicted version key can
+        # never line up again with entries written under an older version.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _count(cache, name):
+    key = f'catalog:stats:{name}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def cached_payload(namespace, key, build):
+    """
+    Return the payload stored under ``key`` in ``namespace``, calling
+    ``build()`` and storing its result on a miss.
+    """
+    cache = get_cache()
+    digest = hashlib.md5(key.encode()).hexdigest()
+    full_key = f'catalog:{namespace}:{_namespace_version(cache, namespace)}:{digest}'
+
+    payload = cache.get(full_key, _MISSING)
+    if payload is not _MISSING:
+        _count(cache, 'hits')
+        return payload
+
+    _count(cache, 'misses')
+    payload = build()
+    cache.set(full_key, payload, settings.CATALOG_CACHE_TIMEOUT)
+    return payload
+
+
+def invalidate(*namespaces):
+    cache = get_cache()
+    for namespace in namespaces:
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            # Nothing has been cached in this namespace yet
+            pass
+
+
+def stats():
+    cache = get_cache()
+    values = cache.get_many(['catalog:stats:hits', 'catalog:stats:misses'])
+    hits = values.get('catalog:stats:hits', 0)
+    misses = values.get('catalog:stats:misses', 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / lookups, 4) if lookups else None,
+    }
+
+
+def reset_stats():
+    get_cache().delete_many(['catalog:stats:hits', 'catalog:stats:misses'])
@@ -0,0 +1,68 @@
+"""
+Conditional GET support (ETag / Last-Modified) driven by ``updated_at``.
+
+The validators come from a single aggregate query, MAX(updated_at) plus a
+row count, so a matching If-None-Match / If-Modified-Since is answered with
+304 before any row is loaded or serialized. Only the ETag carries the
+count, which catches deletions (they do not move MAX(updated_at)), and it
+also tells apart changes made within the same second. Last-Modified has
+neither, so list responses (``many=True``) do not send it, and a lone
+If-Modified-Since on a list is ignored. Responses that embed data from
+related rows (a product's category name) pass those relations as
+``related`` so that editing them changes the validators too.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def get_validators(request, queryset, related=()):
+    aggregates = {f'{name}_modified': Max(f'{name}__updated_at') for name in related}
+    state = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'), **aggregates)
+    stamps = [state['last_modified']] + [state[key] for key in aggregates]
+    last_modified = max((stamp for stamp in stamps if stamp), default=None)
+    seed = '{}|{}|{}'.format(
+        request.get_full_path(),
+        state['count'],
+        last_modified.isoformat() if last_modified else '',
+    )
+    etag = quote_etag(hashlib.md5(seed.encode()).hexdigest())
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return etag, timestamp
+
+
+class ConditionalGetMixin:
+    """
+    Viewset mixin: ``conditional_response(request, queryset, build)`` returns
+    304 when the client's validators still match ``queryset``, otherwise the
+    response from ``build()`` with ETag and, unless ``many``, Last-Modified set.
+    """
+
+    def conditional_response(self, request, queryset, build, related=(), many=False):
+        if request.method not in ('GET', 'HEAD'):
+            return build()
+
+        etag, last_modified = get_validators(request, queryset, related)
+        if many:
+            last_modified = None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return response
+
+        response = build()
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def object_queryset(self, queryset, pk):
+        """``queryset`` narrowed to ``pk``; 404 like get_object() when pk is not a valid key."""
+        try:
+            return queryset.filter(pk=pk)
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
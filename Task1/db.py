@@ -0,0 +1,61 @@
+"""
+Database diagnostics for the health endpoint: round-trip latency, the
+connection settings in effect and, depending on the backend, the SQLite
+pragmas or the PostgreSQL pool counters.
+"""
+import time
+
+from django.db import connections
+
+SQLITE_PRAGMAS = ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'temp_store', 'mmap_size')
+
+
+def _sqlite(connection, cursor):
+    pragmas = {}
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f'PRAGMA {pragma}')
+        row = cursor.fetchone()  # no row for settings that don't apply, e.g. mmap_size in memory
+        pragmas[pragma] = row[0] if row else None
+    return {
+        'pragmas': pragmas,
+        'transaction_mode': connection.transaction_mode or 'DEFERRED',
+    }
+
+
+def _postgresql(connection, cursor):
+    cursor.execute('SHOW max_connections')
+    max_connections = int(cursor.fetchone()[0])
+    cursor.execute('SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()')
+    server_connections = cursor.fetchone()[0]
+    pool = connection.pool
+    return {
+        'max_connections': max_connections,
+        'server_connections': server_connections,
+        # psycopg_pool counters: pool_size, pool_available, requests_waiting, ...
+        'pool': pool.get_stats() if pool is not None else None,
+    }
+
+
+def diagnostics(alias='default'):
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+        ping = time.perf_counter() - start
+        details = {}
+        if connection.vendor == 'sqlite':
+            details = _sqlite(connection, cursor)
+        elif connection.vendor == 'postgresql':
+            details = _postgresql(connection, cursor)
+
+    return {
+        'alias': alias,
+        'vendor': connection.vendor,
+        'name': str(settings_dict['NAME']),
+        'ping_ms': round(ping * 1000, 3),
+        'conn_max_age': settings_dict['CONN_MAX_AGE'],
+        'conn_health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+        **details,
+    }
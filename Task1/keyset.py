@@ -0,0 +1,58 @@
+"""
+Opaque keyset cursors for the async list views, which cannot use DRF's
+(synchronous) CursorPagination. A cursor is the (timestamp, id) of the last
+row served; the next page starts strictly after it.
+"""
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(timestamp, pk):
+    return base64.urlsafe_b64encode(f'{timestamp.isoformat()}|{pk}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        timestamp, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        timestamp = parse_datetime(timestamp)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Invalid cursor.")
+    if timestamp is None:
+        raise InvalidCursor("Invalid cursor.")
+    return timestamp, pk
+
+
+def after(queryset, cursor, timestamp_field, pk_field, descending=False):
+    """Filter ``queryset`` to the rows after ``cursor`` in (timestamp, pk) order."""
+    if not cursor:
+        return queryset
+    timestamp, pk = decode_cursor(cursor)
+    op = 'lt' if descending else 'gt'
+    return queryset.filter(
+        Q(**{f'{timestamp_field}__{op}': timestamp})
+        | Q(**{timestamp_field: timestamp, f'{pk_field}__{op}': pk})
+    )
+
+
+def page_size(request, default=20):
+    try:
+        size = int(request.GET.get('page_size', default))
+    except ValueError:
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def next_link(request, timestamp, pk):
+    params = request.GET.copy()
+    params['cursor'] = encode_cursor(timestamp, pk)
+    return request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
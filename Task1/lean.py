@@ -0,0 +1,124 @@
+"""
+Read-only fast path for list endpoints.
+
+``LeanSerializer`` takes a ModelSerializer and produces the same output from
+a ``.values()`` queryset: each row is already a plain dict, so no model
+instances are built and only the fields whose output differs from the
+database value (decimals, datetimes) are converted. Everything else is
+copied as-is, skipping DRF's per-field ``get_attribute``/``to_representation``
+calls, which dominate the time spent serializing long lists.
+"""
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Fields whose representation of a database value is the value itself
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField, serializers.CharField, serializers.EmailField, serializers.IntegerField,
+    serializers.ReadOnlyField, serializers.SlugField,
+)
+
+
+def decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.decimal_places is None or getattr(field, 'normalize_output', False):
+        return field.to_representation
+    exponent = Decimal(1).scaleb(-field.decimal_places)
+    return lambda value: format(value.quantize(exponent), 'f')
+
+
+def datetime_converter(field):
+    if getattr(field, 'format', api_settings.DATETIME_FORMAT).lower() != ISO_8601:
+        return field.to_representation
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if timezone.is_naive(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    return convert
+
+
+def converter(field):
+    """None if the field outputs the database value unchanged, else a function of it."""
+    if type(field) in PASSTHROUGH_FIELDS:
+        return None
+    if type(field) is serializers.PrimaryKeyRelatedField and field.pk_field is None:
+        return None
+    if type(field) is serializers.DecimalField:
+        return decimal_converter(field)
+    if type(field) is serializers.DateTimeField:
+        return datetime_converter(field)
+    return field.to_representation
+
+
+class LeanSerializer:
+    """
+    ``lean = LeanSerializer(serializer)`` maps the serializer's fields onto
+    ``.values()`` lookups; ``lean.values(queryset)`` fetches the rows and
+    ``lean.to_representation(rows)`` turns them into the serializer's output.
+    ``lean.supported`` is False when a field cannot be read from a single
+    column (a method field, a nested serializer, a many-to-many relation);
+    fall back to the serializer then.
+    """
+
+    def __init__(self, serializer):
+        serializer = getattr(serializer, 'child', serializer)
+        self.opts = serializer.Meta.model._meta
+        self.columns = []
+        self.supported = True
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            lookup = self.lookup(field)
+            if lookup is None:
+                self.supported = False
+                return
+            self.columns.append((name, lookup, converter(field)))
+
+    def lookup(self, field):
+        if field.source == '*' or isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+            return None
+        if isinstance(field, (serializers.SerializerMethodField, serializers.HiddenField)):
+            return None
+        opts = self.opts
+        parts = field.source.split('.')
+        for i, part in enumerate(parts):
+            try:
+                model_field = opts.get_field(part)
+            except FieldDoesNotExist:
+                return None
+            # Reverse relations and many-to-many fields span several rows
+            if not model_field.concrete or model_field.many_to_many:
+                return None
+            if i < len(parts) - 1:
+                if not model_field.is_relation:
+                    return None
+                opts = model_field.related_model._meta
+            elif model_field.is_relation:
+                # values() returns the id of a forward relation
+                return '__'.join(parts[:-1] + [model_field.attname])
+        return '__'.join(parts)
+
+    def values(self, queryset, keep=()):
+        """``queryset.values()`` over the serializer's columns plus the fields in ``keep``."""
+        names = dict.fromkeys([lookup for _, lookup, _ in self.columns] + [name.lstrip('-') for name in keep])
+        return queryset.values(*names)
+
+    def to_representation(self, rows):
+        columns = self.columns
+        return [
+            {
+                name: row[lookup] if convert is None or row[lookup] is None else convert(row[lookup])
+                for name, lookup, convert in columns
+            }
+            for row in rows
+        ]
@@ -0,0 +1,35 @@
+"""
+A logging formatter that writes records as logfmt (key=value pairs), with
+any ``extra={...}`` fields of the call included, so log aggregators can
+index order ids, actors and reasons without parsing free text.
+"""
+import logging
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else came from ``extra``
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def _quote(value):
+    value = str(value)
+    if not value or any(c in value for c in ' ="\n'):
+        value = '"' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+    return value
+
+
+class LogfmtFormatter(logging.Formatter):
+
+    def format(self, record):
+        fields = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith('_'):
+                fields[key] = value
+        line = ' '.join(f'{key}={_quote(value)}' for key, value in fields.items())
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
@@ -0,0 +1,147 @@
+import json
+import platform
+import random
+import threading
+
+import django
+from django.core.cache import caches
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from Task1 import benchmarking
+
+SCENARIOS = ('login', 'login_attack', 'product_list', 'product_retrieve', 'place_order', 'my_orders', 'admin_orders')
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database and drive the REST endpoints concurrently through the test client. "
+        "Prints throughput, p50/p95/p99 latency and query counts per scenario as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f"Comma separated subset of: {', '.join(SCENARIOS)}.")
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario.')
+        parser.add_argument('--login-requests', type=int, default=20, help='Requests for the login scenario (password hashing is slow by design).')
+        parser.add_argument(
+            '--attack-requests', type=int, default=200,
+            help='Requests for the login_attack scenario: 1 in 10 is a real login, the rest credential stuffing from a few IPs.',
+        )
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per scenario.')
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--products', type=int, default=2000)
+        parser.add_argument('--orders', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the data set and request mix.')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+        with benchmarking.temporary_database():
+            self.stderr.write("Seeding...")
+            admin, users, products = benchmarking.seed(
+                users=options['users'], categories=options['categories'],
+                products=options['products'], orders=options['orders'], seed_value=options['seed'],
+            )
+            report = {
+                'meta': {
+                    'revision': benchmarking.git_revision(),
+                    'database': connection.vendor,
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                    'options': {key: options[key] for key in (
+                        'requests', 'login_requests', 'attack_requests', 'concurrency', 'warmup', 'users',
+                        'categories', 'products', 'orders', 'seed',
+                    )},
+                },
+                'scenarios': {},
+            }
+            for name in scenarios:
+                self.stderr.write(f"Running {name}...")
+                report['scenarios'][name] = self.run_scenario(name, admin, users, products, options)
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def run_scenario(self, name, admin, users, products, options):
+        get_token = import_string(jwt_settings.TOKEN_OBTAIN_SERIALIZER).get_token
+        auth = {user.pk: f'Bearer {get_token(user).access_token}' for user in users + [admin]}
+        rng = random.Random(f"{options['seed']}-{name}")
+        picks = [(rng.choice(users), rng.choice(products)) for _ in range(options['warmup'] + options['requests'])]
+        # Real users log in from their own address, so they only meet their own throttle buckets
+        addresses = {user.pk: f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}' for index, user in enumerate(users)}
+        attack_targets = ['admin', 'root', 'test', admin.username]
+        outcomes = {'legit_ok': 0, 'legit_refused': 0, 'attack_rejected': 0, 'attack_throttled': 0, 'attack_succeeded': 0}
+        lock = threading.Lock()
+        # Start from empty throttle buckets and lockouts
+        caches[settings.LOGIN_THROTTLE_CACHE_ALIAS].clear()
+
+        def login_attack(client, i, user):
+            legit = i % 10 == 0
+            if legit:
+                body, address = {'username': user.username, 'password': benchmarking.BENCH_PASSWORD}, addresses[user.pk]
+            else:
+                body = {'username': attack_targets[i % len(attack_targets)], 'password': f'guess-{i}'}
+                address = f'203.0.113.{i % 4}'
+            response = client.post('/api/users/login/', body, content_type='application/json', REMOTE_ADDR=address)
+            if legit:
+                outcome = 'legit_ok' if response.status_code == 200 else 'legit_refused'
+            else:
+                outcome = {401: 'attack_rejected', 429: 'attack_throttled'}.get(response.status_code, 'attack_succeeded')
+            with lock:
+                outcomes[outcome] += 1
+            return outcome in ('legit_ok', 'attack_rejected', 'attack_throttled')
+
+        def task(client, i):
+            user, product = picks[i % len(picks)]
+            if name == 'login_attack':
+                return login_attack(client, i, user)
+            if name == 'login':
+                response = client.post(
+                    '/api/users/login/', {'username': user.username, 'password': benchmarking.BENCH_PASSWORD},
+                    content_type='application/json', REMOTE_ADDR=addresses[user.pk],
+                )
+            elif name == 'product_list':
+                response = client.get('/api/products/', HTTP_AUTHORIZATION=auth[user.pk])
+            elif name == 'product_retrieve':
+                response = client.get(f'/api/products/{product.pk}/', HTTP_AUTHORIZATION=auth[user.pk])
+            elif name == 'place_order':
+                response = client.post(
+                    '/api/orders/place-order/',
+                    {'product': product.pk, 'quantity': 1},
+                    content_type='application/json', HTTP_AUTHORIZATION=auth[user.pk],
+                )
+            elif name == 'my_orders':
+                response = client.get('/api/orders/my-orders/', HTTP_AUTHORIZATION=auth[user.pk])
+            else:
+                response = client.get('/api/orders/admin-orders/', HTTP_AUTHORIZATION=auth[admin.pk])
+            return response.status_code < 400
+
+        count = {'login': options['login_requests'], 'login_attack': options['attack_requests']}.get(name, options['requests'])
+        # Warm up on picks of its own, so the measured run does not hit rows it already cached
+        if options['warmup']:
+            benchmarking.run_concurrently(task, min(options['warmup'], count), options['concurrency'], Client)
+        for key in outcomes:
+            outcomes[key] = 0
+        if name in ('login', 'login_attack'):
+            # The warmup spent throttle tokens and may have locked accounts out.
+            # Only these scenarios need it: the cache also holds the catalog
+            # payloads the other scenarios just warmed.
+            caches[settings.LOGIN_THROTTLE_CACHE_ALIAS].clear()
+        result = benchmarking.run_concurrently(task, count, options['concurrency'], Client, offset=options['warmup'])
+        if name == 'login_attack':
+            result['outcomes'] = outcomes
+        return result
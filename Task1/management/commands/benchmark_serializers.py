@@ -0,0 +1,89 @@
+import io
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from order.models import Order
+from order.serializers import OrderSerializer
+from Product.models import Product
+from Product.serializers import ProductListSerializer
+from Task1 import benchmarking, renderers
+from Task1.lean import LeanSerializer
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database and time the list serialization paths: ModelSerializer + stdlib JSON "
+        "against .values() + LeanSerializer + the fast renderer. Prints median stage timings as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Products and orders in each list.')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per path; the median is reported.')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        with benchmarking.temporary_database():
+            self.stderr.write("Seeding...")
+            benchmarking.seed(products=options['rows'], orders=options['rows'])
+            report = {
+                'meta': {
+                    'revision': benchmarking.git_revision(),
+                    'rows': options['rows'],
+                    'repeat': options['repeat'],
+                    'orjson': renderers.orjson is not None,
+                },
+                'lists': {
+                    'products': self.compare(Product.objects.select_related('category').order_by('pk'), ProductListSerializer, options),
+                    'orders': self.compare(Order.objects.order_by('pk'), OrderSerializer, options),
+                },
+            }
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def compare(self, queryset, serializer_class, options):
+        def standard():
+            rows, fetch = timed(list, queryset.all())
+            data, serialize = timed(lambda: serializer_class(rows, many=True).data)
+            body, render = timed(JSONRenderer().render, data)
+            _, parse = timed(lambda: JSONParser().parse(io.BytesIO(body)))
+            return body, {'fetch': fetch, 'serialize': serialize, 'render': render, 'parse': parse}
+
+        def lean():
+            serializer = LeanSerializer(serializer_class())
+            rows, fetch = timed(list, serializer.values(queryset.all()))
+            data, serialize = timed(serializer.to_representation, rows)
+            body, render = timed(renderers.FastJSONRenderer().render, data)
+            _, parse = timed(lambda: renderers.FastJSONParser().parse(io.BytesIO(body)))
+            return body, {'fetch': fetch, 'serialize': serialize, 'render': render, 'parse': parse}
+
+        results = {}
+        bodies = {}
+        for name, path in (('serializer', standard), ('lean', lean)):
+            runs = []
+            for _ in range(options['repeat']):
+                bodies[name], stages = path()
+                runs.append(stages)
+            timings = {stage: round(statistics.median(run[stage] for run in runs) * 1000, 3) for stage in runs[0]}
+            timings['total'] = round(sum(timings[stage] for stage in ('fetch', 'serialize', 'render')), 3)
+            results[name] = {'ms': timings, 'bytes': len(bodies[name])}
+
+        results['identical_output'] = bodies['serializer'] == bodies['lean']
+        results['speedup'] = round(results['serializer']['ms']['total'] / results['lean']['ms']['total'], 2)
+        return results
+
@@ -0,0 +1,87 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from Category.models import Category
+from order.admin import OrderAdmin
+from order.models import Order
+from order.pagination import OrderCursorPagination
+from Product.admin import ProductAdmin
+from Product.models import Product
+from Product.pagination import ProductCursorPagination
+
+# SQLite reports "SCAN <table>" for a full table scan and
+# "SCAN <table> USING [COVERING] INDEX ..." for an index walk; PostgreSQL
+# reports "Seq Scan on <table>".
+FULL_SCAN_PATTERNS = [
+    re.compile(r'\bSCAN (?P<table>\S+)$'),
+    re.compile(r'\bSeq Scan on (?P<table>\S+)'),
+]
+# A sort the planner could not satisfy from an index
+SORT_PATTERN = re.compile(r'USE TEMP B-TREE FOR ORDER BY|\bSort\b')
+
+
+def hot_queries():
+    """
+    (name, queryset, full_scan_expected) for the queries behind each list
+    endpoint and admin changelist. Sample filter values are fine: EXPLAIN
+    only plans the query.
+    """
+    page = ProductCursorPagination.page_size + 1
+    return [
+        ('ProductViewSet.list', Product.objects.select_related('category').order_by(*ProductCursorPagination.ordering)[:page], False),
+        ('ProductViewSet.retrieve', Product.objects.filter(pk=1), False),
+        ('CategoryViewSet.list', Category.objects.all(), True),
+        ('CategoryViewSet.retrieve', Category.objects.filter(pk=1), False),
+        ('OrderViewSet.user_orders', Order.objects.filter(user_id=1).select_related('product', 'category').order_by(*OrderCursorPagination.ordering)[:OrderCursorPagination.page_size + 1], False),
+        ('OrderViewSet.admin_orders', Order.objects.order_by(*OrderCursorPagination.ordering)[:OrderCursorPagination.page_size + 1], False),
+        ('OrderAdmin.changelist', Order.objects.order_by(*OrderAdmin.ordering)[:OrderAdmin.list_per_page], False),
+        ('OrderAdmin.changelist[order_status]', Order.objects.filter(order_status='pending').order_by(*OrderAdmin.ordering)[:OrderAdmin.list_per_page], False),
+        ('OrderAdmin.changelist[category]', Order.objects.filter(category_id=1).order_by(*OrderAdmin.ordering)[:OrderAdmin.list_per_page], False),
+        ('ProductAdmin.changelist', Product.objects.order_by(*ProductAdmin.ordering)[:ProductAdmin.list_per_page], False),
+        ('ProductAdmin.changelist[is_active,category]', Product.objects.filter(is_active=True, category_id=1).order_by(*ProductAdmin.ordering)[:ProductAdmin.list_per_page], False),
+    ]
+
+
+def full_scans(plan):
+    tables = []
+    for line in plan.splitlines():
+        for pattern in FULL_SCAN_PATTERNS:
+            match = pattern.search(line.strip())
+            if match:
+                tables.append(match.group('table'))
+    return tables
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on the viewset and admin changelist queries and flag full table scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fail', action='store_true', help='Exit with an error if an unexpected full scan is found.')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan of every query.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Database: {connection.vendor}")
+        flagged = []
+
+        for name, queryset, full_scan_expected in hot_queries():
+            plan = queryset.explain()
+            scans = full_scans(plan)
+
+            if scans and not full_scan_expected:
+                flagged.append(name)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}: {', '.join(scans)}"))
+            elif scans:
+                self.stdout.write(f"expected   {name}: full scan of {', '.join(scans)}")
+            elif SORT_PATTERN.search(plan):
+                self.stdout.write(self.style.WARNING(f"sort       {name}: ordering is not served by an index"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"ok         {name}"))
+
+            if options['verbose_plans'] or (scans and not full_scan_expected):
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+        if flagged and options['fail']:
+            raise CommandError(f"{len(flagged)} query(ies) fall back to a full table scan: {', '.join(flagged)}")
@@ -0,0 +1,255 @@
+"""
+In-process request metrics, keyed by DRF view action
+(e.g. ``OrderViewSet.user_orders``, ``ProductViewSet.list``).
+
+For every request RequestMetricsMiddleware records the latency in a
+histogram, the number and total time of SQL queries (through a database
+execute wrapper), and the time spent building serializer ``.data``. The
+numbers live in this process only; scrape every worker or aggregate
+downstream.
+
+Query budgets (settings.QUERY_BUDGETS) cap the number of queries a view may
+run. Going over is logged, or raises QueryBudgetExceeded when
+QUERY_BUDGET_MODE is 'raise', which makes an N+1 regression fail the test
+that triggers it.
+"""
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+_lock = threading.Lock()
+_views = {}
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class _RequestMetrics:
+    def __init__(self):
+        self.view = None
+        self.queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.in_serializer = False
+
+
+class _ViewStats:
+    def __init__(self):
+        self.count = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.queries = 0
+        self.max_queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.budget_exceeded = 0
+
+    def as_dict(self):
+        return {
+            'requests': self.count,
+            'latency_seconds': {
+                'sum': round(self.latency_sum, 6),
+                'mean': round(self.latency_sum / self.count, 6) if self.count else None,
+                'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], self._cumulative())),
+            },
+            'sql_queries': {
+                'total': self.queries,
+                'mean': round(self.queries / self.count, 2) if self.count else None,
+                'max': self.max_queries,
+            },
+            'sql_seconds': round(self.query_time, 6),
+            'serializer_seconds': round(self.serializer_time, 6),
+            'budget_exceeded': self.budget_exceeded,
+        }
+
+    def _cumulative(self):
+        total = 0
+        counts = []
+        for count in self.buckets:
+            total += count
+            counts.append(total)
+        return counts
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if metrics is not None:
+            metrics.queries += 1
+            metrics.query_time += time.perf_counter() - start
+
+
+def install_serializer_timer():
+    """
+    Wrap ``BaseSerializer.data`` so the time spent building response data is
+    attributed to the current request. Called once from Task1Config.ready()
+    when RequestMetricsMiddleware is installed. Serializer.data and ListSerializer.data
+    both delegate to it. Only the outermost call is timed, and lazy queries
+    made while serializing count towards both SQL and serializer time.
+    """
+    original = BaseSerializer.data
+    if getattr(original.fget, 'timed', False):
+        return
+
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics.in_serializer:
+            return original.fget(self)
+        metrics.in_serializer = True
+        start = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics.in_serializer = False
+
+    data.timed = True
+    BaseSerializer.data = property(data)
+
+
+def view_name(request, view_func):
+    cls = getattr(view_func, 'cls', None)
+    actions = getattr(view_func, 'actions', None)
+    if cls is not None and actions:
+        return f"{cls.__name__}.{actions.get(request.method.lower(), request.method.lower())}"
+    if cls is not None:
+        return cls.__name__
+    return getattr(view_func, '__qualname__', repr(view_func))
+
+
+def _record(metrics, elapsed):
+    with _lock:
+        stats = _views.get(metrics.view)
+        if stats is None:
+            stats = _views[metrics.view] = _ViewStats()
+        stats.count += 1
+        stats.latency_sum += elapsed
+        stats.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        stats.queries += metrics.queries
+        stats.max_queries = max(stats.max_queries, metrics.queries)
+        stats.query_time += metrics.query_time
+        stats.serializer_time += metrics.serializer_time
+    return stats
+
+
+def _check_budget(metrics, stats):
+    budget = getattr(settings, 'QUERY_BUDGETS', {}).get(metrics.view)
+    if budget is None or metrics.queries <= budget:
+        return
+    with _lock:
+        stats.budget_exceeded += 1
+    message = f"{metrics.view} ran {metrics.queries} SQL queries, over its budget of {budget}"
+    if getattr(settings, 'QUERY_BUDGET_MODE', 'log') == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def snapshot():
+    with _lock:
+        return {view: stats.as_dict() for view, stats in sorted(_views.items())}
+
+
+def reset():
+    with _lock:
+        _views.clear()
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text():
+    with _lock:
+        views = sorted(_views.items())
+        lines = [
+            '# HELP api_request_duration_seconds Request latency per view action.',
+            '# TYPE api_request_duration_seconds histogram',
+        ]
+        for view, stats in views:
+            label = _label(view)
+            bounds = [str(b) for b in LATENCY_BUCKETS] + ['+Inf']
+            for bound, count in zip(bounds, stats._cumulative()):
+                lines.append(f'api_request_duration_seconds_bucket{{view="{label}",le="{bound}"}} {count}')
+            lines.append(f'api_request_duration_seconds_sum{{view="{label}"}} {stats.latency_sum:.6f}')
+            lines.append(f'api_request_duration_seconds_count{{view="{label}"}} {stats.count}')
+
+        counters = [
+            ('api_sql_queries_total', 'SQL queries run per view action.', 'queries', '{}'),
+            ('api_sql_duration_seconds_total', 'Time spent in SQL per view action.', 'query_time', '{:.6f}'),
+            ('api_serializer_duration_seconds_total', 'Time spent building serializer data per view action.', 'serializer_time', '{:.6f}'),
+            ('api_query_budget_exceeded_total', 'Requests that ran more SQL queries than their budget.', 'budget_exceeded', '{}'),
+        ]
+        for name, help_text, attribute, fmt in counters:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for view, stats in views:
+                lines.append(f'{name}{{view="{_label(view)}"}} {fmt.format(getattr(stats, attribute))}')
+    return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def _measure(wrapped_connections):
+    metrics = _RequestMetrics()
+    token = _current.set(metrics)
+    start = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            for connection in wrapped_connections:
+                stack.enter_context(connection.execute_wrapper(_record_query))
+            yield
+    finally:
+        _current.reset(token)
+    elapsed = time.perf_counter() - start
+
+    if metrics.view is not None:
+        stats = _record(metrics, elapsed)
+        _check_budget(metrics, stats)
+
+
+class RequestMetricsMiddleware:
+    # Async-capable so async views keep the async request path under ASGI.
+    # Database connections are thread-local, and the async ORM runs its
+    # queries in the thread-sensitive executor, so the async path wraps
+    # that thread's connections rather than the event loop's.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with _measure(connections.all()):
+            response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request):
+        with _measure(await sync_to_async(connections.all)()):
+            response = await self.get_response(request)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view = view_name(request, view_func)
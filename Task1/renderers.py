@@ -0,0 +1,60 @@
+"""
+JSON renderer and parser backed by orjson when it is installed, falling
+back to DRF's stdlib implementation otherwise.
+
+The output is byte-for-byte what ``rest_framework.renderers.JSONRenderer``
+produces for the compact (default) style: datetimes, dates, decimals and
+lazy strings are handed to DRF's own encoder, so a datetime still ends in
+``Z`` rather than ``+00:00`` and a bare Decimal still becomes a number.
+Pretty-printed responses (``; indent=N`` or the browsable API) go through
+the stdlib path, which supports any indent.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+if orjson is not None:
+    # Route datetimes through the fallback so they are formatted the DRF
+    # way; allow int keys, which json.dumps accepts too.
+    DUMPS_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+# See JSONRenderer.render: keep the output a strict JavaScript subset
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=DUMPS_OPTIONS)
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        # orjson rejects NaN and Infinity, like the strict stdlib parser
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -44,10 +44,13 @@ INSTALLED_APPS = [
     'order',
     'user',
     'Product',
+    'inventory',
     'drf_yasg',
+    'Task1',  # project-wide management commands
 ]
 
 MIDDLEWARE = [
+    'Task1.metrics.RequestMetricsMiddleware',  # first, so its timing covers the whole stack
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -81,11 +84,21 @@ WSGI_APPLICATION = 'Task1.wsgi.application'
 REST_FRAMEWORK = {
     # Use SimpleJWT for authentication
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',  # JWT authentication
+        'user.authentication.ClaimsJWTAuthentication',  # JWT authentication from token claims
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',  # By default, users need to be authenticated
     ],
+    # orjson-backed JSON when installed, stdlib json otherwise (same output)
+    'DEFAULT_RENDERER_CLASSES': [
+        'Task1.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'Task1.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 SWAGGER_SETTINGS = {
@@ -108,19 +121,117 @@ SIMPLE_JWT = {
     'ALGORITHM': 'HS256',  
     'SIGNING_KEY': 'your-secret-key-here',  # Keep it secret, change this to a real key
     'AUTH_HEADER_TYPES': ('Bearer',),  # The Authorization header will contain 'Bearer <token>'
+    'TOKEN_OBTAIN_SERIALIZER': 'user.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'user.serializers.ClaimsTokenRefreshSerializer',
 }
 
+# Login throttling (user/throttling.py). Buckets are (burst, refill per second).
+LOGIN_THROTTLE_CACHE_ALIAS = 'default'
+LOGIN_IP_BUCKET = (30, 0.5)
+LOGIN_USERNAME_BUCKET = (10, 0.2)  # per (client IP, username)
+LOGIN_LOCKOUT_THRESHOLD = int(os.getenv('LOGIN_LOCKOUT_THRESHOLD', 10))
+LOGIN_LOCKOUT_SECONDS = int(os.getenv('LOGIN_LOCKOUT_SECONDS', 900))
+
+# The first hasher hashes new passwords; hashes with other parameters or
+# algorithms are upgraded to it on the user's next successful login.
+PASSWORD_HASHERS = [
+    'user.hashers.TunedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', 1_000_000))
+
+# Per-process cache of User rows for request.user.instance (user/authentication.py)
+USER_CACHE_MAXSIZE = 1024
+USER_CACHE_TTL = 300
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# DB_ENGINE picks the profile: 'sqlite' (default) or 'postgres'.
+#
+# SQLite: WAL lets readers run alongside the single writer, the busy timeout
+# makes a writer wait for the lock instead of failing with "database is
+# locked", and IMMEDIATE transactions take the write lock up front so two
+# transactions never both read and then deadlock upgrading to write. The
+# pragmas in init_command run on every new connection.
+#
+# PostgreSQL: Django's native connection pool (needs `psycopg[pool]`), or
+# with DB_POOL=False persistent connections kept for DB_CONN_MAX_AGE seconds.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    DB_POOL = os.getenv('DB_POOL', 'True') == 'True'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'ecommerce'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # The pool already keeps connections open; the two can't be combined
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+                    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 20)),
+                    'timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+                } if DB_POOL else False,
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 0)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 20)),
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA cache_size=-20000;'
+                    'PRAGMA temp_store=MEMORY;'
+                    'PRAGMA mmap_size=134217728;'
+                ),
+            },
+        }
+    }
+
+
+# Cache
+# CACHE_BACKEND picks the store: 'locmem' (default), 'file', 'redis', or a
+# dotted path to any other Django cache backend. The redis backend speaks the
+# plain Redis protocol, so a local Redis-compatible server can stand in for
+# the real one; it needs the redis package installed.
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_DEFAULT_LOCATIONS = {
+    'file': str(BASE_DIR / '.cache'),
+    'redis': 'redis://127.0.0.1:6379/1',
+}
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': CACHE_BACKENDS.get(CACHE_BACKEND, CACHE_BACKEND),
+        'LOCATION': os.getenv('CACHE_LOCATION', CACHE_DEFAULT_LOCATIONS.get(CACHE_BACKEND, '')),
     }
 }
 
+# Category/product payloads are cached in this alias and dropped by the
+# post_save/post_delete signals in Category.models and Product.models.
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', 300))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -171,8 +282,44 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Outbox delivery (see user/outbox.py and `manage.py send_outbox`)
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 5))
+OUTBOX_RETRY_BASE_SECONDS = 30
+OUTBOX_RETRY_MAX_SECONDS = 3600
+OUTBOX_LEASE_SECONDS = 300
+
+# Application logs go to stderr as logfmt key=value lines (see Task1/logfmt.py)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'logfmt': {'()': 'Task1.logfmt.LogfmtFormatter'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'logfmt'},
+    },
+    'loggers': {
+        logger: {'handlers': ['console'], 'level': os.getenv('LOG_LEVEL', 'INFO'), 'propagate': False}
+        for logger in ('Category', 'Product', 'Task1', 'inventory', 'order', 'user')
+    },
+}
 
-
-
-
-
+# How long an Idempotency-Key is remembered (see order/idempotency.py and
+# `manage.py purge_idempotency_keys`)
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', 24 * 60 * 60))
+# How long an in-flight request holds its key before a retry may take it over
+IDEMPOTENCY_KEY_LEASE = int(os.getenv('IDEMPOTENCY_KEY_LEASE', 60))
+
+# Request metrics (see Task1/metrics.py). QUERY_BUDGETS caps the SQL queries
+# per view action; QUERY_BUDGET_MODE = 'raise' turns an overrun into an
+# exception (use it in tests), 'log' only warns.
+QUERY_BUDGETS = {
+    'ProductViewSet.list': 4,
+    'ProductViewSet.retrieve': 3,
+    'ProductViewSet.search': 4,
+    'CategoryViewSet.list': 3,
+    'CategoryViewSet.retrieve': 3,
+    'OrderViewSet.user_orders': 4,
+    'OrderViewSet.admin_orders': 4,
+}
+QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'log')
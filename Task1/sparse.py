@@ -0,0 +1,119 @@
+"""
+Sparse fieldsets and compact list encoding for read endpoints.
+
+``?fields=a,b`` keeps only the named fields of each object and
+``?exclude=c`` drops the named ones. The trimming happens in the
+serializer and, through ``sparse_queryset``, in the SQL: only the columns
+the remaining fields read are selected, and only the relations they
+traverse are joined. ``?compact=1`` encodes a list of objects as one list
+of field names plus a row of values per object.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from drf_yasg import openapi
+from rest_framework import serializers
+
+SPARSE_PARAMETERS = [
+    openapi.Parameter('fields', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='Comma separated fields to include'),
+    openapi.Parameter('exclude', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='Comma separated fields to leave out'),
+]
+COMPACT_PARAMETER = openapi.Parameter(
+    'compact', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN,
+    description='Encode the list as {"fields": [...], "rows": [[...], ...]}',
+)
+
+
+def requested_fields(request):
+    """(fields, exclude) named in the query string; both empty when not asked for."""
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return [], []
+
+    def names(param):
+        return [name.strip() for name in request.query_params.get(param, '').split(',') if name.strip()]
+
+    return names('fields'), names('exclude')
+
+
+def wants_compact(request):
+    return request.query_params.get('compact', '').lower() in ('1', 'true')
+
+
+class SparseFieldsetSerializerMixin:
+    """Serializer mixin that drops the fields excluded by the request in its context."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        only, exclude = requested_fields(self.context.get('request'))
+        if not only and not exclude:
+            return
+
+        unknown = (set(only) | set(exclude)) - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError({'fields': [f"Unknown field(s): {', '.join(sorted(unknown))}."]})
+        for name in list(self.fields):
+            if (only and name not in only) or name in exclude:
+                self.fields.pop(name)
+
+
+def sparse_queryset(queryset, serializer, keep=()):
+    """
+    Restrict ``queryset`` to the columns and joins ``serializer``'s fields
+    read, plus the pk and the model fields in ``keep`` (e.g. the pagination
+    ordering). Left unchanged when the request in the serializer's context
+    asked for no sparse fieldset, or if a field's source cannot be mapped
+    to model fields, such as a SerializerMethodField.
+    """
+    serializer = getattr(serializer, 'child', serializer)
+    if not any(requested_fields(serializer.context.get('request'))):
+        return queryset
+    opts = queryset.model._meta
+    columns = {opts.pk.name, *keep}
+    relations = set()
+
+    for field in serializer.fields.values():
+        if field.source == '*':
+            return queryset
+        parts = field.source.split('.')
+        try:
+            opts.get_field(parts[0])
+        except FieldDoesNotExist:
+            return queryset
+        if len(parts) > 1:
+            relations.add('__'.join(parts[:-1]))
+        columns.add('__'.join(parts))
+
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*columns)
+
+
+def compact(data):
+    """
+    [{...}, ...] -> {'fields': [...], 'rows': [[...], ...]}. Paginated
+    payloads keep their links and have their 'results' encoded.
+    """
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        return {**data, 'results': compact(data['results'])}
+    if not isinstance(data, list):
+        return data
+    fields = list(data[0]) if data else []
+    return {'fields': fields, 'rows': [[item[name] for name in fields] for item in data]}
+
+
+class SparseFieldsetsMixin:
+    """
+    Viewset mixin: ``sparse(queryset)`` trims a read queryset to the
+    requested fields, ``shape(data)`` applies the compact encoding to a list
+    payload when asked for.
+    """
+
+    def sparse(self, queryset):
+        if not any(requested_fields(self.request)):
+            return queryset
+        # The cursor is built from the last row's ordering fields
+        ordering = getattr(self.pagination_class, 'ordering', ()) if self.action == 'list' else ()
+        keep = [name.lstrip('-') for name in ordering]
+        return sparse_queryset(queryset, self.get_serializer(), keep)
+
+    def shape(self, data):
+        return compact(data) if wants_compact(self.request) else data
@@ -20,6 +20,10 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from django.urls import path,include
+from Task1 import views
+from Category import async_views as category_async_views
+from Product import async_views as product_async_views
+from order import async_views as order_async_views
 
 schema_view = get_schema_view(
    openapi.Info(
@@ -38,6 +42,17 @@ urlpatterns = [
     path('api/products/', include('Product.urls')),
     path('api/users/', include('user.urls')),
     path('api/orders/', include('order.urls')),
+    path('api/inventory/', include('inventory.urls')),
+    path('api/cache/stats/', views.cache_stats, name='cache-stats'),
+    path('api/metrics/', views.request_metrics, name='metrics'),
+    path('api/health/db/', views.database_health, name='health-db'),
+    path('api/metrics/prometheus/', views.request_metrics_prometheus, name='metrics-prometheus'),
+    # Async-native read paths (Django async views + async ORM) for ASGI deployments
+    path('api/async/products/', product_async_views.product_list, name='async-product-list'),
+    path('api/async/products/<int:pk>/', product_async_views.product_detail, name='async-product-detail'),
+    path('api/async/categories/', category_async_views.category_list, name='async-category-list'),
+    path('api/async/orders/my-orders/', order_async_views.user_orders, name='async-my-orders'),
+    path('api/async/orders/events/', order_async_views.event_feed, name='async-order-events'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
@@ -0,0 +1,34 @@
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from Task1 import cache as catalog_cache
+from Task1 import db
+from Task1 import metrics
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Hit/miss counters of the catalog cache."""
+    return Response(catalog_cache.stats())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def request_metrics(request):
+    """Latency, SQL and serializer metrics per view action for this process."""
+    return Response(metrics.snapshot())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def request_metrics_prometheus(request):
+    return HttpResponse(metrics.prometheus_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def database_health(request):
+    """Database round trip, connection settings and pool usage."""
+    return Response(db.diagnostics())
@@ -0,0 +1,27 @@
+from django.contrib import admin
+from .models import Stock, Reservation
+
+class StockAdmin(admin.ModelAdmin):
+    list_display = ('product', 'quantity', 'updated_at')
+
+    search_fields = ('product__name',)
+
+    ordering = ('quantity',)
+
+    list_per_page = 50
+
+admin.site.register(Stock, StockAdmin)
+
+
+class ReservationAdmin(admin.ModelAdmin):
+    list_display = ('order', 'product', 'quantity', 'status', 'created_at', 'released_at')
+
+    list_filter = ('status', 'created_at')
+
+    search_fields = ('product__name', 'order__user__username')
+
+    ordering = ('-created_at',)
+
+    list_per_page = 50
+
+admin.site.register(Reservation, ReservationAdmin)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class InventoryConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'inventory'
+
+    def ready(self):
+        import inventory.signals  # Return reserved stock when orders are cancelled
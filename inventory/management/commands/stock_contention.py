@@ -0,0 +1,81 @@
+import json
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Sum
+from django.test import Client
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from inventory.models import Reservation, Stock
+from order.models import Order
+from Task1 import benchmarking
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer a single hot product with concurrent place-order requests against a scratch database "
+        "and check that stock never oversells. Prints throughput, latency and the stock audit as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stock', type=int, default=100, help='Units of the hot product on hand.')
+        parser.add_argument('--requests', type=int, default=400, help='Orders attempted (more than --stock to force sell-outs).')
+        parser.add_argument('--quantity', type=int, default=1, help='Units per order.')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        with benchmarking.temporary_database():
+            admin, users, products = benchmarking.seed(
+                users=options['users'], categories=1, products=1, orders=0,
+            )
+            product = products[0]
+            product.is_active = True
+            product.save(update_fields=['is_active'])
+            Stock.objects.create(product=product, quantity=options['stock'])
+
+            get_token = import_string(jwt_settings.TOKEN_OBTAIN_SERIALIZER).get_token
+            auth = [f'Bearer {get_token(user).access_token}' for user in users]
+            body = {'product': product.pk, 'quantity': options['quantity']}
+            outcomes = {'placed': 0, 'sold_out': 0, 'failed': 0}
+            lock = threading.Lock()
+
+            def task(client, i):
+                response = client.post(
+                    '/api/orders/place-order/', body,
+                    content_type='application/json', HTTP_AUTHORIZATION=auth[i % len(auth)],
+                )
+                outcome = {201: 'placed', 409: 'sold_out'}.get(response.status_code, 'failed')
+                with lock:
+                    outcomes[outcome] += 1
+                # A sold-out answer is the correct response, not an error
+                return outcome != 'failed'
+
+            self.stderr.write(f"Placing {options['requests']} orders for {options['stock']} units...")
+            result = benchmarking.run_concurrently(task, options['requests'], options['concurrency'], Client)
+
+            remaining = Stock.objects.get(pk=product.pk).quantity
+            reserved = Reservation.objects.filter(status=Reservation.RESERVED).aggregate(units=Sum('quantity'))['units'] or 0
+            ordered = Order.objects.filter(product=product).aggregate(units=Sum('quantity'))['units'] or 0
+            result['outcomes'] = outcomes
+            result['audit'] = {
+                'initial_stock': options['stock'],
+                'remaining_stock': remaining,
+                'units_reserved': reserved,
+                'units_ordered': ordered,
+                'oversold': ordered > options['stock'],
+                'consistent': remaining + reserved == options['stock'] and reserved == ordered,
+            }
+            result['meta'] = {'revision': benchmarking.git_revision(), 'database': connection.vendor}
+
+        output = json.dumps(result, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+        if result['audit']['oversold'] or not result['audit']['consistent']:
+            self.stderr.write(self.style.ERROR("Stock audit failed."))
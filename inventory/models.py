@@ -0,0 +1,32 @@
+from django.db import models
+from Product.models import Product
+from order.models import Order
+
+
+class Stock(models.Model):
+    # Products without a Stock row are not tracked and never run out
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='stock')
+    quantity = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.product} ({self.quantity})"
+
+
+class Reservation(models.Model):
+    RESERVED = 'reserved'
+    RELEASED = 'released'
+    STATUS = [
+        (RESERVED, 'Reserved'),
+        (RELEASED, 'Released'),
+    ]
+
+    order = models.OneToOneField(Order, on_delete=models.CASCADE, related_name='reservation')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='reservations')
+    quantity = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS, default=RESERVED)
+    created_at = models.DateTimeField(auto_now_add=True)
+    released_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Order {self.order_id}: {self.quantity} x {self.product_id} ({self.status})"
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+from .models import Stock
+
+
+class StockSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Stock
+        fields = ['product', 'quantity', 'updated_at']
+        read_only_fields = ['updated_at']
+
+
+class AdjustStockSerializer(serializers.Serializer):
+    delta = serializers.IntegerField(help_text='Units to add; negative to remove.')
+
+    def validate_delta(self, value):
+        if value == 0:
+            raise serializers.ValidationError("Delta must not be zero.")
+        return value
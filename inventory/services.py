@@ -0,0 +1,131 @@
+"""
+Stock reservation without read-modify-write races.
+
+Every decrement is a single conditional ``UPDATE ... SET quantity =
+quantity - n WHERE quantity >= n``: the database applies it atomically per
+row, so concurrent buyers of the same product can never take it below
+zero, whatever the isolation level. A cart reserves all of its products
+with one such statement and is rolled back as a whole if any row fails the
+condition.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from .models import Reservation, Stock
+
+
+class OutOfStock(Exception):
+    def __init__(self, available):
+        # {product_id: quantity still available} for the products that fell short
+        self.available = available
+        super().__init__(f"Insufficient stock for product(s): {', '.join(map(str, sorted(available)))}")
+
+
+class _Shortfall(Exception):
+    pass
+
+
+def _by_product(quantities):
+    return Case(
+        *(When(product_id=product_id, then=Value(quantity)) for product_id, quantity in quantities.items()),
+        default=Value(0),
+    )
+
+
+def reserve(quantities):
+    """
+    Take ``{product_id: quantity}`` out of stock, all or nothing. Returns
+    the ids of the tracked products (those with a Stock row); raises
+    OutOfStock, leaving every row untouched, if any of them is short.
+    """
+    if not quantities:
+        return set()
+
+    enough = Q()
+    for product_id, quantity in quantities.items():
+        enough |= Q(product_id=product_id, quantity__gte=quantity)
+
+    try:
+        with transaction.atomic():
+            updated = Stock.objects.filter(enough).update(
+                quantity=F('quantity') - _by_product(quantities), updated_at=timezone.now(),
+            )
+            if updated == len(quantities):
+                return set(quantities)
+            # Fewer rows matched: either untracked products or a shortfall
+            tracked = set(Stock.objects.filter(product_id__in=quantities).values_list('product_id', flat=True))
+            if updated == len(tracked):
+                return tracked
+            raise _Shortfall
+    except _Shortfall:
+        pass
+
+    # The savepoint rolled the partial decrement back, so these are the
+    # levels the request was refused against.
+    levels = Stock.objects.filter(product_id__in=quantities).values_list('product_id', 'quantity')
+    raise OutOfStock({product_id: level for product_id, level in levels if level < quantities[product_id]})
+
+
+def reserve_orders(orders):
+    """
+    Reserve stock for freshly created orders and record a Reservation for
+    each tracked one. Call inside the transaction that created the orders,
+    so that OutOfStock rolls them back too.
+    """
+    quantities = defaultdict(int)
+    for order in orders:
+        quantities[order.product_id] += order.quantity
+    tracked = reserve(quantities)
+    Reservation.objects.bulk_create(
+        Reservation(order=order, product_id=order.product_id, quantity=order.quantity)
+        for order in orders if order.product_id in tracked
+    )
+
+
+def release(order_ids):
+    """
+    Return the stock held by the given orders. Idempotent: only reservations
+    still in the reserved state are released, each exactly once.
+    """
+    with transaction.atomic():
+        reservations = list(
+            Reservation.objects.select_for_update()
+            .filter(order_id__in=order_ids, status=Reservation.RESERVED)
+            .values_list('pk', 'product_id', 'quantity')
+        )
+        if not reservations:
+            return 0
+
+        Reservation.objects.filter(pk__in=[pk for pk, _, _ in reservations]).update(
+            status=Reservation.RELEASED, released_at=timezone.now(),
+        )
+        quantities = defaultdict(int)
+        for _, product_id, quantity in reservations:
+            quantities[product_id] += quantity
+        Stock.objects.filter(product_id__in=quantities).update(
+            quantity=F('quantity') + _by_product(quantities), updated_at=timezone.now(),
+        )
+        return len(reservations)
+
+
+def restock(product_id, delta):
+    """
+    Add (or, with a negative ``delta``, remove) stock for one product,
+    creating its Stock row on first use. Returns the new level, or None if
+    removing ``-delta`` would go below zero.
+    """
+    with transaction.atomic():
+        if delta < 0:
+            updated = Stock.objects.filter(product_id=product_id, quantity__gte=-delta).update(
+                quantity=F('quantity') + delta, updated_at=timezone.now(),
+            )
+            if not updated:
+                return None
+        else:
+            stock, created = Stock.objects.get_or_create(product_id=product_id, defaults={'quantity': delta})
+            if not created:
+                Stock.objects.filter(pk=stock.pk).update(quantity=F('quantity') + delta, updated_at=timezone.now())
+        return Stock.objects.values_list('quantity', flat=True).get(product_id=product_id)
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from order.models import Order
+from . import services
+
+
+@receiver(post_save, sender=Order)
+def release_cancelled_stock(sender, instance, created, **kwargs):
+    # Covers cancel_order, the delivery status endpoint and the admin alike
+    if not created and instance.order_status == 'cancelled':
+        services.release([instance.pk])
+
+
+@receiver(pre_delete, sender=Order)
+def release_deleted_stock(sender, instance, **kwargs):
+    services.release([instance.pk])
@@ -0,0 +1,127 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import Group, User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from Category.models import Category
+from Product.models import Product
+from order.models import Order
+from user.serializers import ClaimsTokenObtainPairSerializer
+from . import services
+from .models import Reservation, Stock
+
+
+def client_for(user):
+    client = APIClient()
+    token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+class InventoryTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.get_or_create(name='is_admin')
+        Group.objects.get_or_create(name='is_not_admin')
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', is_staff=True)
+        cls.customer = User.objects.create_user('customer', 'customer@example.com', 'pw')
+        category = Category.objects.create(name='Shoes', description='d', created_by=cls.admin, updated_by=cls.admin)
+        cls.product = Product.objects.create(name='Boot', price=Decimal('10.00'), category=category, created_by=cls.admin)
+        cls.other = Product.objects.create(name='Sandal', price=Decimal('5.00'), category=category, created_by=cls.admin)
+        cls.untracked = Product.objects.create(name='Sock', price=Decimal('1.00'), category=category, created_by=cls.admin)
+        Stock.objects.create(product=cls.product, quantity=3)
+        Stock.objects.create(product=cls.other, quantity=1)
+
+    def setUp(self):
+        self.client = client_for(self.customer)
+        self.admin_client = client_for(self.admin)
+
+    def level(self, product):
+        return Stock.objects.get(product=product).quantity
+
+    def place(self, product, quantity):
+        body = {'product': product.pk, 'quantity': quantity}
+        return self.client.post('/api/orders/place-order/', body, format='json')
+
+    def place_cart(self, *lines):
+        lines = [{'product': product.pk, 'quantity': quantity} for product, quantity in lines]
+        return self.client.post('/api/orders/place-cart/', {'lines': lines}, format='json')
+
+
+class ReserveTests(InventoryTestCase):
+    def test_order_takes_stock(self):
+        self.assertEqual(self.place(self.product, 2).status_code, 201)
+        self.assertEqual(self.level(self.product), 1)
+        self.assertEqual(Reservation.objects.get().quantity, 2)
+
+    def test_oversell_is_refused(self):
+        response = self.place(self.product, 4)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['available'], {self.product.pk: 3})
+        self.assertEqual(self.level(self.product), 3)
+        self.assertFalse(Order.objects.exists())
+
+    def test_last_unit_is_sold_once(self):
+        self.assertEqual(self.place(self.other, 1).status_code, 201)
+        self.assertEqual(self.place(self.other, 1).status_code, 409)
+        self.assertEqual(self.level(self.other), 0)
+
+    def test_cart_short_on_one_line_takes_nothing(self):
+        response = self.place_cart((self.product, 2), (self.other, 2))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['available'], {self.other.pk: 1})
+        self.assertEqual((self.level(self.product), self.level(self.other)), (3, 1))
+        self.assertFalse(Order.objects.exists())
+
+    def test_untracked_products_are_not_limited(self):
+        self.assertEqual(self.place_cart((self.untracked, 100), (self.product, 1)).status_code, 201)
+        self.assertEqual(self.level(self.product), 2)
+        self.assertEqual(services.reserve({self.untracked.pk: 5}), set())
+
+
+class ReleaseTests(InventoryTestCase):
+    def test_cancel_returns_stock_once(self):
+        order_id = self.place(self.product, 2).data['id']
+        responses = [
+            self.client.post(f'/api/orders/{order_id}/cancel/', {'reason': 'changed my mind'}, format='json')
+            for _ in range(2)
+        ]
+        self.assertEqual([response.status_code for response in responses], [200, 400])
+        self.assertEqual(self.level(self.product), 3)
+        self.assertEqual(Reservation.objects.get().status, Reservation.RELEASED)
+        self.assertEqual(services.release([order_id]), 0)
+
+    def test_shipped_or_delivered_orders_cannot_be_cancelled(self):
+        order_id = self.place(self.product, 2).data['id']
+        for order_status in ('delivered', 'shipped'):
+            Order.objects.filter(pk=order_id).update(order_status=order_status)
+            response = self.client.post(f'/api/orders/{order_id}/cancel/', {'reason': 'too late'}, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(Order.objects.get(pk=order_id).order_status, order_status)
+        self.assertEqual(self.level(self.product), 1)
+        self.assertEqual(Reservation.objects.get().status, Reservation.RESERVED)
+
+    def test_bulk_cancel_returns_stock(self):
+        orders = [self.place(self.product, 1).data['id'] for _ in range(3)]
+        self.assertEqual(self.level(self.product), 0)
+        response = self.admin_client.post('/api/orders/bulk-status/', {'ids': orders, 'order_status': 'cancelled'}, format='json')
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(self.level(self.product), 3)
+
+
+class AdjustTests(InventoryTestCase):
+    def test_restock_creates_and_adds(self):
+        url = f'/api/inventory/stock/{self.untracked.pk}/adjust/'
+        self.assertEqual(self.admin_client.post(url, {'delta': 5}, format='json').data['quantity'], 5)
+        self.assertEqual(self.admin_client.post(url, {'delta': 2}, format='json').data['quantity'], 7)
+
+    def test_removing_more_than_held_is_refused(self):
+        url = f'/api/inventory/stock/{self.product.pk}/adjust/'
+        self.assertEqual(self.admin_client.post(url, {'delta': -4}, format='json').status_code, 409)
+        self.assertEqual(self.level(self.product), 3)
+        self.assertEqual(self.admin_client.post(url, {'delta': -3}, format='json').data['quantity'], 0)
+
+    def test_customers_cannot_adjust(self):
+        url = f'/api/inventory/stock/{self.product.pk}/adjust/'
+        self.assertEqual(self.client.post(url, {'delta': 5}, format='json').status_code, 403)
@@ -0,0 +1,33 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from drf_yasg.utils import swagger_auto_schema
+from Product.models import Product
+from . import services
+from .models import Stock
+from .serializers import StockSerializer, AdjustStockSerializer
+
+
+class StockViewSet(viewsets.ModelViewSet):
+    queryset = Stock.objects.all().order_by('product_id')
+    serializer_class = StockSerializer
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        request_body=AdjustStockSerializer,
+        responses={200: StockSerializer}
+    )
+    @action(detail=False, methods=['post'], url_path=r'(?P<product_id>\d+)/adjust')
+    def adjust(self, request, product_id=None):
+        # Relative change applied in the database, safe next to concurrent orders
+        serializer = AdjustStockSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        if not Product.objects.filter(pk=product_id).exists():
+            return Response({"detail": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        quantity = services.restock(int(product_id), serializer.validated_data['delta'])
+        if quantity is None:
+            return Response({"detail": "Not enough stock to remove."}, status=status.HTTP_409_CONFLICT)
+        return Response(StockSerializer(Stock.objects.get(pk=product_id)).data)
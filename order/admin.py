@@ -1,8 +1,26 @@
-from django.contrib import admin
-from .models import Order
+from django.contrib import admin, messages
+from . import events, transitions
+from .models import Order, OrderEvent, SalesRollup
+
+def transition_action(to_status, label):
+    def move(modeladmin, request, queryset):
+        results = transitions.bulk_transition(
+            list(queryset.values_list('pk', flat=True)), to_status,
+            actor_id=request.user.pk, reason='Bulk change in admin',
+        )
+        moved = sum(result['ok'] for result in results)
+        modeladmin.message_user(request, f"{moved} order(s) marked as {label.lower()}.", messages.SUCCESS)
+        if moved < len(results):
+            modeladmin.message_user(
+                request, f"{len(results) - moved} order(s) skipped: not allowed to move to {label.lower()}.", messages.WARNING,
+            )
+    move.__name__ = f'mark_{to_status}'
+    move.short_description = f"Mark selected orders as {label.lower()}"
+    return move
+
 
 class OrderAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user', 'product', 'category', 'quantity', 'total_price', 'order_status', 'created_at', 'updated_at')
+    list_display = ('id', 'user', 'product', 'category', 'quantity', 'unit_price', 'total_price', 'order_status', 'created_at', 'updated_at')
 
     list_filter = ('order_status', 'category', 'created_at')
 
@@ -12,4 +30,39 @@ class OrderAdmin(admin.ModelAdmin):
 
     list_per_page = 20
 
+    actions = [transition_action(status, label) for status, label in Order.ORDER_STATUS if status != 'pending']
+
+    def save_model(self, request, obj, form, change):
+        events.describe(obj, actor_id=request.user.pk, reason='Changed in admin' if change else '')
+        super().save_model(request, obj, form, change)
+
 admin.site.register(Order, OrderAdmin)
+
+
+class OrderEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'order', 'from_status', 'to_status', 'reason', 'actor', 'created_at')
+
+    list_filter = ('to_status', 'created_at')
+
+    search_fields = ('=order__id', 'actor__username', 'reason')
+
+    ordering = ('-id',)
+
+    list_per_page = 50
+
+    def has_change_permission(self, request, obj=None):
+        return False  # append-only
+
+admin.site.register(OrderEvent, OrderEventAdmin)
+
+
+class SalesRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'category', 'product', 'order_status', 'orders', 'units', 'revenue')
+
+    list_filter = ('order_status', 'day')
+
+    ordering = ('-day',)
+
+    list_per_page = 50
+
+admin.site.register(SalesRollup, SalesRollupAdmin)
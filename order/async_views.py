@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from Task1 import keyset
+from user.authentication import async_login_required
+from . import events
+from .models import Order
+from .serializers import OrderEventFeedQuerySerializer, OrderEventSerializer, OrderReadSerializer
+
+
+@require_GET
+@async_login_required
+async def user_orders(request):
+    # Async-native counterpart of OrderViewSet.user_orders, newest first
+    size = keyset.page_size(request)
+    orders = (
+        Order.objects.filter(user_id=request.user.pk)
+        .select_related('product', 'category')
+        .order_by('-created_at', '-id')
+    )
+    try:
+        orders = keyset.after(orders, request.GET.get('cursor'), 'created_at', 'id', descending=True)
+    except keyset.InvalidCursor as e:
+        return JsonResponse({"detail": str(e)}, status=404)
+
+    page = [order async for order in orders[:size + 1]]
+    has_next = len(page) > size
+    page = page[:size]
+    return JsonResponse({
+        'next': keyset.next_link(request, page[-1].created_at, page[-1].id) if has_next else None,
+        'results': OrderReadSerializer(page, many=True).data,
+    })
+
+
+@require_GET
+@async_login_required
+async def event_feed(request):
+    # Async counterpart of OrderViewSet.event_feed: a long poll waits on the
+    # event loop instead of holding a worker thread, so it may use the full ?wait=
+    if not request.user.is_staff:
+        return JsonResponse({"detail": "You do not have permission to perform this action."}, status=403)
+    params = OrderEventFeedQuerySerializer(data=request.GET)
+    if not params.is_valid():
+        return JsonResponse(params.errors, status=400)
+    filters = params.validated_data
+
+    feed = events.feed(filters['since'], filters.get('order'))
+    deadline = time.monotonic() + filters['wait']
+    while True:
+        batch = [event async for event in feed[:filters['limit']]]
+        if batch or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(events.FEED_POLL_SECONDS)
+
+    return JsonResponse({
+        'events': OrderEventSerializer(batch, many=True).data,
+        'next_since': batch[-1].id if batch else filters['since'],
+    })
@@ -0,0 +1,52 @@
+"""
+Recording of OrderEvent rows.
+
+Single saves are recorded by the signals in order/signals.py, which compare
+the saved status with the one the order was loaded with. Callers that know
+who made the change and why attach it with ``describe`` before saving;
+bulk writes, which bypass signals, call ``record_bulk`` themselves.
+"""
+from .models import OrderEvent
+
+# How often a long-polling events request re-checks for new rows
+FEED_POLL_SECONDS = 0.5
+
+
+def feed(since, order_id=None):
+    """Events after id ``since``, oldest first, for the change feed endpoints."""
+    events = OrderEvent.objects.filter(id__gt=since).order_by('id')
+    if order_id is not None:
+        events = events.filter(order_id=order_id)
+    return events
+
+
+def describe(order, actor_id=None, reason=''):
+    """Attach the actor and reason to be recorded with ``order``'s next status change."""
+    order._event_actor_id = actor_id
+    order._event_reason = reason or ''
+
+
+def record(order, from_status, default_actor_id=None):
+    OrderEvent.objects.create(
+        order_id=order.pk,
+        from_status=from_status or '',
+        to_status=order.order_status,
+        actor_id=getattr(order, '_event_actor_id', None) or default_actor_id,
+        reason=getattr(order, '_event_reason', ''),
+    )
+    describe(order)
+
+
+def record_bulk(orders, from_statuses=None, actor_id=None, reason=''):
+    """``from_statuses`` maps order id to its previous status; omit it for new orders."""
+    from_statuses = from_statuses or {}
+    OrderEvent.objects.bulk_create(
+        OrderEvent(
+            order_id=order.pk,
+            from_status=from_statuses.get(order.pk, ''),
+            to_status=order.order_status,
+            actor_id=actor_id,
+            reason=reason or '',
+        )
+        for order in orders
+    )
@@ -0,0 +1,125 @@
+"""
+Idempotency-Key support for the order write endpoints.
+
+The first request with a given key claims it by inserting an
+IdempotencyKey row (the unique constraint on user + key settles races),
+runs, and stores its response on the row. Later requests with the same key
+get the stored response back without the view running again. A key reused
+with a different request body is refused with 422, and one whose first
+request is still running with 409. A claim is a lease of
+IDEMPOTENCY_KEY_LEASE seconds: if the process running the request dies,
+a retry after the lease has lapsed takes the key over instead of getting
+409 until the key expires. Each claim writes its own locked_until, and
+only the current holder may store or release the key.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from drf_yasg import openapi
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+
+IDEMPOTENCY_KEY_PARAMETER = openapi.Parameter(
+    HEADER, openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+    description='Optional client-generated key; retries with the same key return the original response.',
+)
+
+
+def request_hash(request):
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    payload = json.dumps([request.method, request.path, data], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _claim(user_id, key, digest):
+    """
+    Try to take ``key`` for this request. Returns (lease, None) when it was
+    free or its holder's lease had lapsed, otherwise (None, the row holding
+    it); the row is None when the key kept changing hands underneath us.
+    """
+    for _ in range(2):
+        now = timezone.now()
+        lease = now + timedelta(seconds=settings.IDEMPOTENCY_KEY_LEASE)
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(
+                    user_id=user_id, key=key, request_hash=digest, locked_until=lease,
+                    expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+                )
+            return lease, None
+        except IntegrityError:
+            existing = IdempotencyKey.objects.filter(user_id=user_id, key=key).first()
+            if existing is None:
+                continue
+            if existing.expires_at <= now:
+                # Expired but not purged yet: treat it as a fresh key
+                IdempotencyKey.objects.filter(pk=existing.pk, expires_at__lte=now).delete()
+                continue
+            # Rows claimed before leases existed have no locked_until
+            stalled = existing.response_status is None and (existing.locked_until is None or existing.locked_until <= now)
+            if stalled and existing.request_hash == digest:
+                # The request holding it died; the conditional UPDATE picks one taker
+                holder = {'locked_until': existing.locked_until} if existing.locked_until else {'locked_until__isnull': True}
+                taken = IdempotencyKey.objects.filter(
+                    pk=existing.pk, response_status__isnull=True, **holder,
+                ).update(locked_until=lease)
+                if taken:
+                    return lease, None
+                continue
+            return None, existing
+    return None, None
+
+
+def idempotent(view):
+    """Decorate a ViewSet action to honour the Idempotency-Key header."""
+
+    @wraps(view)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(self, request, *args, **kwargs)
+        if len(key) > 255:
+            return Response({"detail": f"{HEADER} must be at most 255 characters."}, status=status.HTTP_400_BAD_REQUEST)
+
+        user_id = request.user.pk
+        digest = request_hash(request)
+        lease, existing = _claim(user_id, key, digest)
+        if lease is None:
+            if existing is not None and existing.request_hash != digest:
+                return Response(
+                    {"detail": f"This {HEADER} was already used with a different request."},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            if existing is None or existing.response_status is None:
+                return Response(
+                    {"detail": f"A request with this {HEADER} is still being processed."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            return Response(existing.response_body, status=existing.response_status, headers={'Idempotent-Replayed': 'true'})
+
+        # Matches nothing once a retry has taken the key over from us
+        held = IdempotencyKey.objects.filter(user_id=user_id, key=key, locked_until=lease)
+        try:
+            response = view(self, request, *args, **kwargs)
+        except Exception:
+            held.delete()
+            raise
+        if response.status_code >= 500:
+            # Server errors are not remembered, so the client's retry runs again
+            held.delete()
+        else:
+            held.update(response_status=response.status_code, response_body=response.data, locked_until=None)
+        return response
+
+    return wrapper
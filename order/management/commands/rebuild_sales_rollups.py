@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from order import rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the SalesRollup table from scratch from the order history."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rollups.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} rollup row(s)."))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-18 03:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    Order = apps.get_model('order', 'Order')
+    SalesRollup = apps.get_model('order', 'SalesRollup')
+    rows = (
+        Order.objects.order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'category_id', 'product_id', 'order_status')
+        .annotate(orders=Count('id'), units=Sum('quantity'), revenue=Sum('total_price'))
+    )
+    SalesRollup.objects.bulk_create((SalesRollup(**row) for row in rows.iterator()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Category', '0002_alter_category_name'),
+        ('Product', '0002_product_indexes'),
+        ('order', '0002_order_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('order_status', models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('shipped', 'Shipped'), ('dispatched', 'Dispatched'), ('delivered', 'Delivered'), ('cancelled', 'Cancelled'), ('out_for_delivery', 'Out for Delivery')], max_length=20)),
+                ('orders', models.IntegerField(default=0)),
+                ('units', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='Category.category')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='Product.product')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'category', 'product', 'order_status'), name='sales_rollup_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 04:02
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # The unit price paid is what the stored total says, not today's price.
+    # Divided in Python: SQLite stores whole totals as integers and would
+    # divide them as integers.
+    Order = apps.get_model('order', 'Order')
+    batch = []
+    for order in Order.objects.filter(quantity__gt=0).only('quantity', 'total_price').iterator(chunk_size=2000):
+        order.unit_price = (order.total_price / order.quantity).quantize(Decimal('0.01'))
+        batch.append(order)
+        if len(batch) == 1000:
+            Order.objects.bulk_update(batch, ['unit_price'])
+            batch = []
+    Order.objects.bulk_update(batch, ['unit_price'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0005_order_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='unit_price',
+            field=models.DecimalField(blank=True, decimal_places=2, default=0, max_digits=10),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
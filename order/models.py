@@ -3,6 +3,7 @@ from django.db import models
 # Create your models here.
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
 from Category.models import Category  
 from Product.models import Product  
 
@@ -17,18 +18,127 @@ class Order(models.Model):
         ('out_for_delivery', 'Out for Delivery'),
     ]
 
+    # Status moves accepted by the bulk transition endpoint and admin actions
+    ALLOWED_TRANSITIONS = {
+        'pending': {'confirmed', 'cancelled'},
+        'confirmed': {'shipped', 'dispatched', 'cancelled'},
+        'shipped': {'dispatched', 'out_for_delivery', 'delivered'},
+        'dispatched': {'out_for_delivery', 'delivered'},
+        'out_for_delivery': {'delivered'},
+        'delivered': set(),
+        'cancelled': set(),
+    }
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField()
+    # Product price when the order was placed; later repricing leaves it alone
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
     order_status = models.CharField(max_length=20, choices=ORDER_STATUS, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # my-orders: a user's orders, newest first
+            models.Index(fields=['user', '-created_at'], name='order_user_created_idx'),
+            # admin changelist: status/category filters ordered by -created_at
+            models.Index(fields=['order_status', 'created_at'], name='order_status_created_idx'),
+            models.Index(fields=['category', 'created_at'], name='order_category_created_idx'),
+            models.Index(fields=['created_at'], name='order_created_idx'),
+        ]
+
+    # The rollup values as loaded, so a later save can move the order's
+    # contribution from the old rollup bucket to the new one
+    # (order/signals.py). Taken in from_db rather than post_init so orders
+    # built in memory pay nothing for it.
+    _rollup_snapshot = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        from order import rollups
+        instance._rollup_snapshot = rollups.snapshot(instance)
+        return instance
+
     def __str__(self):
         return f'Order #{self.id} by {self.user.username}'
     def save(self, *args, **kwargs):
-        if self.product and self.quantity:
-            self.total_price = self.product.price * self.quantity
-        super(Order, self).save(*args, **kwargs)
\ No newline at end of file
+        # Price the order once, when it is placed. Later saves (status
+        # updates, cancellations) keep the stored total: a backfilled
+        # unit_price is rounded, so recomputing would rewrite old totals.
+        if self._state.adding and self.product_id and self.quantity:
+            if self.unit_price is None:
+                self.unit_price = self.product.price
+            self.total_price = self.unit_price * self.quantity
+        super(Order, self).save(*args, **kwargs)
+
+
+class OrderEvent(models.Model):
+    """
+    Append-only log of order status transitions, read incrementally by the
+    events change feed. from_status is empty for the order's creation. Rows
+    outlive their order, hence no foreign key constraint.
+    """
+    order = models.ForeignKey(Order, on_delete=models.DO_NOTHING, db_constraint=False, related_name='events')
+    from_status = models.CharField(max_length=20, choices=Order.ORDER_STATUS, blank=True)
+    to_status = models.CharField(max_length=20, choices=Order.ORDER_STATUS)
+    reason = models.CharField(max_length=255, blank=True)
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Order #{self.order_id}: {self.from_status or "-"} -> {self.to_status}'
+
+
+class SalesRollup(models.Model):
+    """
+    Order totals per (day, category, product, order_status), kept up to date
+    by order.rollups as orders are written, so analytics reads a few hundred
+    rows instead of the whole order history.
+    """
+    day = models.DateField()
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='+')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    order_status = models.CharField(max_length=20, choices=Order.ORDER_STATUS)
+    orders = models.IntegerField(default=0)
+    units = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'category', 'product', 'order_status'], name='sales_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f'{self.day} {self.product_id} {self.order_status}: {self.orders} orders'
+
+
+class IdempotencyKey(models.Model):
+    """
+    A client's Idempotency-Key and the response it got, so that a retried
+    request is answered from here instead of being executed again. A row
+    without a response_status belongs to a request still in flight, which
+    holds it until locked_until; after that a retry may take it over.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='idempotency_user_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}:{self.key}'
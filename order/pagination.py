@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OrderCursorPagination(CursorPagination):
+    """
+    Newest-first keyset pagination for a user's order history, served from
+    the (user, -created_at) index, and for the admin list, served from the
+    created_at index; id breaks ties between orders created in the same
+    instant.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
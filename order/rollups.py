@@ -0,0 +1,89 @@
+"""
+Incremental maintenance of SalesRollup.
+
+Every write path that changes an order's day, category, product, status,
+quantity or total feeds the old and new values through ``apply`` as signed
+deltas. Single saves go through the signals in order/signals.py; bulk
+writes (bulk_create, queryset.update) call ``record``/``apply`` directly
+because they bypass signals.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from order.models import Order, SalesRollup
+
+ROLLUP_FIELDS = ('created_at', 'category', 'product', 'order_status', 'quantity', 'total_price')
+ROLLUP_ATTNAMES = {'created_at', 'category_id', 'product_id', 'order_status', 'quantity', 'total_price'}
+
+
+def snapshot(order):
+    """The rollup-relevant values of ``order``, or None if not all are loaded."""
+    # Cheap enough for Order.from_db: no deferred-field walk, no date math
+    if not ROLLUP_ATTNAMES.issubset(order.__dict__) or order.created_at is None:
+        return None
+    return (
+        order.created_at,
+        order.category_id,
+        order.product_id,
+        order.order_status,
+        order.quantity,
+        order.total_price,
+    )
+
+
+def add_delta(deltas, row, sign):
+    created_at, category_id, product_id, status, quantity, total_price = row
+    bucket = deltas[(timezone.localdate(created_at), category_id, product_id, status)]
+    bucket[0] += sign
+    bucket[1] += sign * quantity
+    bucket[2] += sign * Decimal(total_price)
+
+
+def new_deltas():
+    return defaultdict(lambda: [0, 0, Decimal('0')])
+
+
+def apply(deltas):
+    for (day, category_id, product_id, status), (orders, units, revenue) in deltas.items():
+        if not (orders or units or revenue):
+            continue
+        key = dict(day=day, category_id=category_id, product_id=product_id, order_status=status)
+        changes = dict(orders=F('orders') + orders, units=F('units') + units, revenue=F('revenue') + revenue)
+        if SalesRollup.objects.filter(**key).update(**changes):
+            continue
+        try:
+            with transaction.atomic():
+                SalesRollup.objects.create(orders=orders, units=units, revenue=revenue, **key)
+        except IntegrityError:
+            # Another writer created the row first
+            SalesRollup.objects.filter(**key).update(**changes)
+
+
+def record(orders, sign=1):
+    """Add (or with sign=-1, remove) ``orders`` to the rollups."""
+    deltas = new_deltas()
+    for order in orders:
+        row = snapshot(order)
+        add_delta(deltas, row, sign)
+        # Bulk-created instances never went through post_save
+        order._rollup_snapshot = row if sign > 0 else None
+    apply(deltas)
+
+
+def rebuild(batch_size=1000):
+    """Recompute every rollup row from the order table."""
+    rows = (
+        Order.objects.order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'category_id', 'product_id', 'order_status')
+        .annotate(orders=Count('id'), units=Sum('quantity'), revenue=Sum('total_price'))
+    )
+    with transaction.atomic():
+        SalesRollup.objects.all().delete()
+        SalesRollup.objects.bulk_create((SalesRollup(**row) for row in rows.iterator()), batch_size=batch_size)
+    return SalesRollup.objects.count()
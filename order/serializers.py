@@ -1,19 +1,103 @@
 from rest_framework import serializers
-from .models import Order
+from Task1.sparse import SparseFieldsetSerializerMixin
+from .models import Order, OrderEvent
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = '__all__'
-        read_only_fields = ['user', 'order_status', 'created_at', 'updated_at']
+        # Priced and categorised from the product on the server
+        read_only_fields = ['user', 'category', 'unit_price', 'total_price', 'order_status', 'created_at', 'updated_at']
+
+
+class OrderReadSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """
+    Compact order history entry with the product and category names inlined,
+    so clients need no follow-up lookups. Load orders with
+    select_related('product', 'category').
+    """
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    category_name = serializers.CharField(source='category.name', read_only=True)
+
+    class Meta:
+        model = Order
+        fields = [
+            'id', 'product', 'product_name', 'category', 'category_name', 'quantity',
+            'unit_price', 'total_price', 'order_status', 'created_at', 'updated_at',
+        ]
 
 
 class DeliveryStatusSerializer(serializers.ModelSerializer):
+    reason = serializers.CharField(max_length=255, required=False, allow_blank=True, write_only=True)
+
     class Meta:
         model = Order
-        fields = ['order_status']
+        fields = ['order_status', 'reason']
+
+    def validate_order_status(self, value):
+        # Same table as the bulk endpoint: a cancelled order's stock has been
+        # released, so it must not come back to life here
+        current = self.instance.order_status
+        if value != current and value not in Order.ALLOWED_TRANSITIONS.get(current, ()):
+            raise serializers.ValidationError(f"Cannot move an order from {current} to {value}.")
+        return value
+
+    def update(self, instance, validated_data):
+        # Recorded on the OrderEvent by the view, not stored on the order
+        validated_data.pop('reason', None)
+        return super().update(instance, validated_data)
 
 
 class CancelOrderSerializer(serializers.Serializer):
-    reason = serializers.CharField(max_length=255)
\ No newline at end of file
+    reason = serializers.CharField(max_length=255)
+
+class CartLineSerializer(serializers.Serializer):
+    product = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class PlaceCartSerializer(serializers.Serializer):
+    lines = CartLineSerializer(many=True, allow_empty=False, max_length=100)
+
+
+class SalesAnalyticsQuerySerializer(serializers.Serializer):
+    GROUP_BY_CHOICES = ('day', 'category', 'product', 'order_status')
+
+    group_by = serializers.CharField(default='day', help_text='Comma separated: day, category, product, order_status')
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    order_status = serializers.ChoiceField(choices=Order.ORDER_STATUS, required=False)
+
+    def validate_group_by(self, value):
+        fields = [field.strip() for field in value.split(',') if field.strip()]
+        invalid = [field for field in fields if field not in self.GROUP_BY_CHOICES]
+        if not fields or invalid:
+            raise serializers.ValidationError(f"Choose from: {', '.join(self.GROUP_BY_CHOICES)}.")
+        return list(dict.fromkeys(fields))
+
+
+class OrderExportQuerySerializer(serializers.Serializer):
+    output = serializers.ChoiceField(choices=['ndjson', 'csv'], default='ndjson')
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    order_status = serializers.MultipleChoiceField(choices=Order.ORDER_STATUS, required=False)
+
+
+class OrderEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OrderEvent
+        fields = ['id', 'order', 'from_status', 'to_status', 'reason', 'actor', 'created_at']
+
+
+class OrderEventFeedQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0, default=0, help_text='Return events with an id greater than this.')
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=100)
+    wait = serializers.IntegerField(min_value=0, max_value=30, default=0, help_text='Seconds to wait for new events when there are none (at most 5 outside the async feed).')
+    order = serializers.IntegerField(min_value=1, required=False, help_text='Only events of this order.')
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000)
+    order_status = serializers.ChoiceField(choices=Order.ORDER_STATUS)
+    reason = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
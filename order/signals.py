@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from order import events, rollups
+from order.models import Order
+
+
+@receiver(pre_save, sender=Order)
+def load_rollup_values(sender, instance, **kwargs):
+    if instance.pk and instance._rollup_snapshot is None and not instance._state.adding:
+        # Loaded with deferred fields (or not loaded at all): read the stored values instead
+        instance._rollup_snapshot = stored_snapshot(instance)
+
+
+def stored_snapshot(instance):
+    stored = Order.objects.filter(pk=instance.pk).only(*rollups.ROLLUP_FIELDS).first()
+    return stored and rollups.snapshot(stored)
+
+
+@receiver(post_save, sender=Order)
+def record_status_event(sender, instance, created, **kwargs):
+    # Runs before update_rollups replaces the snapshot it reads from
+    if created:
+        events.record(instance, None, default_actor_id=instance.user_id)
+    elif instance._rollup_snapshot is not None and instance._rollup_snapshot[3] != instance.order_status:
+        events.record(instance, instance._rollup_snapshot[3])
+
+
+@receiver(post_save, sender=Order)
+def update_rollups(sender, instance, **kwargs):
+    # A save with deferred fields left those columns as stored
+    current = rollups.snapshot(instance) or stored_snapshot(instance)
+    if current == instance._rollup_snapshot:
+        return
+
+    deltas = rollups.new_deltas()
+    if instance._rollup_snapshot is not None:
+        rollups.add_delta(deltas, instance._rollup_snapshot, -1)
+    rollups.add_delta(deltas, current, 1)
+    rollups.apply(deltas)
+    instance._rollup_snapshot = current
+
+
+@receiver(post_delete, sender=Order)
+def remove_from_rollups(sender, instance, **kwargs):
+    if instance._rollup_snapshot is not None:
+        deltas = rollups.new_deltas()
+        rollups.add_delta(deltas, instance._rollup_snapshot, -1)
+        rollups.apply(deltas)
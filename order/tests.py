@@ -1,3 +1,283 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from Category.models import Category
+from Product.models import Product
+from user.serializers import ClaimsTokenObtainPairSerializer
+from . import rollups
+from .models import IdempotencyKey, Order, SalesRollup
+
+
+def client_for(user):
+    client = APIClient()
+    token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def bearer(user):
+    return {'Authorization': f'Bearer {ClaimsTokenObtainPairSerializer.get_token(user).access_token}'}
+
+
+class OrderTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.get_or_create(name='is_admin')
+        Group.objects.get_or_create(name='is_not_admin')
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', is_staff=True)
+        cls.customer = User.objects.create_user('customer', 'customer@example.com', 'pw')
+        cls.category = Category.objects.create(name='Shoes', description='d', created_by=cls.admin, updated_by=cls.admin)
+        cls.product = Product.objects.create(name='Boot', price=Decimal('12.50'), category=cls.category, created_by=cls.admin)
+        cls.other = Product.objects.create(name='Sandal', price=Decimal('4.00'), category=cls.category, created_by=cls.admin)
+
+    def setUp(self):
+        cache.clear()
+        self.client = client_for(self.customer)
+        self.admin_client = client_for(self.admin)
+
+    def place(self, product=None, quantity=1, **extra):
+        product = product or self.product
+        body = {'product': product.pk, 'quantity': quantity}
+        return self.client.post('/api/orders/place-order/', body, format='json', **extra)
+
+
+class PlaceOrderTests(OrderTestCase):
+    def test_price_is_taken_from_the_product(self):
+        response = self.place(quantity=3)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Decimal(response.data['unit_price']), Decimal('12.50'))
+        self.assertEqual(Decimal(response.data['total_price']), Decimal('37.50'))
+
+    def test_client_total_and_category_are_ignored(self):
+        books = Category.objects.create(name='Books', description='d', created_by=self.admin, updated_by=self.admin)
+        body = {'product': self.product.pk, 'category': books.pk, 'quantity': 2, 'total_price': '0.01'}
+        response = self.client.post('/api/orders/place-order/', body, format='json')
+        self.assertEqual(response.status_code, 201)
+        order = Order.objects.get(pk=response.data['id'])
+        self.assertEqual((order.category_id, order.total_price), (self.category.pk, Decimal('25.00')))
+
+    def test_later_saves_keep_the_price_paid(self):
+        order = Order.objects.get(pk=self.place(quantity=2).data['id'])
+        Product.objects.filter(pk=self.product.pk).update(price=Decimal('99.00'))
+        order.order_status = 'confirmed'
+        order.save()
+        order.refresh_from_db()
+        self.assertEqual(order.unit_price, Decimal('12.50'))
+        self.assertEqual(order.total_price, Decimal('25.00'))
+
+    def test_cart_is_all_or_nothing(self):
+        lines = [{'product': self.product.pk, 'quantity': 2}, {'product': self.other.pk, 'quantity': 1}]
+        response = self.client.post('/api/orders/place-cart/', {'lines': lines}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 2)
+
+        lines.append({'product': 99999, 'quantity': 1})
+        response = self.client.post('/api/orders/place-cart/', {'lines': lines}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Order.objects.count(), 2)
+
+
+class IdempotencyTests(OrderTestCase):
+    def test_retry_replays_the_response(self):
+        first = self.place(HTTP_IDEMPOTENCY_KEY='k1')
+        second = self.place(HTTP_IDEMPOTENCY_KEY='k1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_key_reused_with_another_body_is_refused(self):
+        self.place(HTTP_IDEMPOTENCY_KEY='k1')
+        self.assertEqual(self.place(quantity=2, HTTP_IDEMPOTENCY_KEY='k1').status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_keys_are_per_user(self):
+        self.place(HTTP_IDEMPOTENCY_KEY='k1')
+        body = {'product': self.product.pk, 'quantity': 1}
+        response = self.admin_client.post('/api/orders/place-order/', body, format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_in_flight_key_conflicts_until_its_lease_lapses(self):
+        self.place(HTTP_IDEMPOTENCY_KEY='k1')
+        Order.objects.all().delete()
+        # As if the first request were still running
+        IdempotencyKey.objects.filter(key='k1').update(
+            response_status=None, response_body=None, locked_until=timezone.now() + timedelta(seconds=30),
+        )
+        self.assertEqual(self.place(HTTP_IDEMPOTENCY_KEY='k1').status_code, 409)
+
+        # ... and as if its process had died
+        IdempotencyKey.objects.filter(key='k1').update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.place(HTTP_IDEMPOTENCY_KEY='k1').status_code, 201)
+        self.assertEqual(Order.objects.count(), 1)
+        key = IdempotencyKey.objects.get(key='k1')
+        self.assertEqual(key.response_status, 201)
+        self.assertIsNone(key.locked_until)
+
+    def test_expired_key_runs_again(self):
+        self.place(HTTP_IDEMPOTENCY_KEY='k1')
+        IdempotencyKey.objects.filter(key='k1').update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.place(HTTP_IDEMPOTENCY_KEY='k1').status_code, 201)
+        self.assertEqual(Order.objects.count(), 2)
+
+
+class StatusTransitionTests(OrderTestCase):
+    def test_delivery_status_follows_allowed_transitions(self):
+        order_id = self.place().data['id']
+        url = f'/api/orders/{order_id}/update-delivery-status/'
+        self.assertEqual(self.admin_client.patch(url, {'order_status': 'delivered'}, format='json').status_code, 400)
+        self.assertEqual(self.admin_client.patch(url, {'order_status': 'confirmed'}, format='json').status_code, 200)
+        self.assertEqual(Order.objects.get(pk=order_id).order_status, 'confirmed')
+
+    def test_bulk_status_moves_only_valid_orders(self):
+        pending = self.place().data['id']
+        delivered = self.place().data['id']
+        Order.objects.filter(pk=delivered).update(order_status='delivered')
+        response = self.admin_client.post(
+            '/api/orders/bulk-status/', {'ids': [pending, delivered, 99999], 'order_status': 'confirmed'}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual([result['ok'] for result in response.data['results']], [True, False, False])
+        self.assertEqual(Order.objects.get(pk=pending).order_status, 'confirmed')
+
+    def test_event_feed_lists_changes_after_since(self):
+        order_id = self.place().data['id']
+        response = self.admin_client.get('/api/orders/events/')
+        self.assertEqual([event['to_status'] for event in response.data['events']], ['pending'])
+
+        since = response.data['next_since']
+        self.admin_client.patch(f'/api/orders/{order_id}/update-delivery-status/', {'order_status': 'confirmed', 'reason': 'paid'}, format='json')
+        events = self.admin_client.get(f'/api/orders/events/?since={since}').data['events']
+        self.assertEqual([(event['from_status'], event['to_status'], event['reason']) for event in events], [('pending', 'confirmed', 'paid')])
+        self.assertEqual(self.client.get('/api/orders/events/').status_code, 403)
+
+
+class RollupTests(OrderTestCase):
+    def rollup(self):
+        rows = SalesRollup.objects.exclude(orders=0).values_list('day', 'product_id', 'order_status', 'orders', 'units', 'revenue')
+        return sorted(rows)
+
+    def test_incremental_rollups_match_a_rebuild(self):
+        first = self.place(quantity=2).data['id']
+        self.place(product=self.other, quantity=3)
+        self.client.post('/api/orders/place-cart/', {'lines': [{'product': self.product.pk, 'quantity': 1}]}, format='json')
+        self.admin_client.patch(f'/api/orders/{first}/update-delivery-status/', {'order_status': 'confirmed'}, format='json')
+        self.client.post(f'/api/orders/{first}/cancel/', {'reason': 'changed my mind'}, format='json')
+        Order.objects.filter(product=self.other).delete()
+
+        incremental = self.rollup()
+        rollups.rebuild()
+        self.assertEqual(incremental, self.rollup())
+
+    def test_saves_from_partially_loaded_orders_keep_rollups_in_step(self):
+        first = self.place(quantity=2).data['id']
+        order = Order.objects.only('order_status').get(pk=first)
+        order.order_status = 'confirmed'
+        order.save()
+        order = Order.objects.get(pk=first)
+        order.quantity = 4
+        order.save()
+
+        incremental = self.rollup()
+        rollups.rebuild()
+        self.assertEqual(incremental, self.rollup())
+
+    def test_analytics_reads_the_rollups(self):
+        self.place(quantity=2)
+        self.place(product=self.other, quantity=1)
+        response = self.admin_client.get('/api/orders/analytics/?group_by=product')
+        self.assertEqual(
+            [(row['product_name'], row['orders'], row['units'], row['revenue']) for row in response.data],
+            [('Boot', 1, 2, '25.00'), ('Sandal', 1, 1, '4.00')],
+        )
+
+
+class MyOrdersTests(OrderTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(25):
+            Order.objects.create(user=cls.customer, product=cls.product, category=cls.category, quantity=1, total_price=0)
+        Order.objects.create(user=cls.admin, product=cls.product, category=cls.category, quantity=1, total_price=0)
+
+    def test_keyset_pages_cover_own_orders_newest_first(self):
+        seen = []
+        url = '/api/orders/my-orders/?page_size=7'
+        while url:
+            response = self.client.get(url)
+            seen += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+        expected = list(Order.objects.filter(user=self.customer).order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_etag_changes_when_product_is_renamed(self):
+        etag = self.client.get('/api/orders/my-orders/')['ETag']
+        self.assertEqual(self.client.get('/api/orders/my-orders/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.product.name = 'Hiking Boot'
+        self.product.save()
+        response = self.client.get('/api/orders/my-orders/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['product_name'], 'Hiking Boot')
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_my_orders_within_budget(self):
+        self.assertEqual(self.client.get('/api/orders/my-orders/?page_size=100').status_code, 200)
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_admin_orders_within_budget(self):
+        response = self.admin_client.get('/api/orders/admin-orders/?page_size=100')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 26)
+
+    def test_admin_orders_pages_cover_every_order_once(self):
+        seen = []
+        url = '/api/orders/admin-orders/?page_size=10'
+        while url:
+            response = self.admin_client.get(url)
+            self.assertLessEqual(len(response.data['results']), 10)
+            seen += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, list(Order.objects.order_by('-created_at', '-id').values_list('pk', flat=True)))
+
+
+class AsyncOrderTests(MyOrdersTests):
+    def setUp(self):
+        super().setUp()
+        self.async_client = AsyncClient()
+        self.auth = bearer(self.customer)
+        self.admin_auth = bearer(self.admin)
+
+    async def test_my_orders_pages_match_the_sync_endpoint(self):
+        seen = []
+        url = '/api/async/orders/my-orders/?page_size=7'
+        while url:
+            response = await self.async_client.get(url, headers=self.auth)
+            self.assertEqual(response.status_code, 200)
+            seen += response.json()['results']
+            url = response.json()['next']
+        sync = await sync_to_async(self.client.get)('/api/orders/my-orders/?page_size=100')
+        self.assertEqual(seen, sync.json()['results'])
+
+    async def test_my_orders_bad_cursor_is_404(self):
+        response = await self.async_client.get('/api/async/orders/my-orders/?cursor=bm9wZQ', headers=self.auth)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual((await self.async_client.get('/api/async/orders/my-orders/')).status_code, 401)
+
+    async def test_event_feed_is_for_admins(self):
+        url = '/api/async/orders/events/?limit=5'
+        self.assertEqual((await self.async_client.get(url, headers=self.auth)).status_code, 403)
+        self.assertEqual((await self.async_client.get(url)).status_code, 401)
+        response = await self.async_client.get(url, headers=self.admin_auth)
+        self.assertEqual(response.status_code, 200)
+        sync = await sync_to_async(self.admin_client.get)('/api/orders/events/?limit=5')
+        self.assertEqual(response.json(), sync.json())
@@ -0,0 +1,65 @@
+"""
+Bulk order status transitions.
+
+``bulk_transition`` validates every requested order against
+Order.ALLOWED_TRANSITIONS, then moves all the valid ones with one UPDATE.
+Since a queryset update bypasses the Order signals, it does their work
+itself: rollup deltas, OrderEvent rows and, for cancellations, the stock
+release.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from inventory import services as inventory
+from . import events, rollups
+from .models import Order
+
+
+def sources(to_status):
+    return {status for status, targets in Order.ALLOWED_TRANSITIONS.items() if to_status in targets}
+
+
+def bulk_transition(order_ids, to_status, actor_id=None, reason=''):
+    """
+    Move ``order_ids`` to ``to_status``. Returns one result per id, in
+    order: {'id', 'ok', 'from_status'} plus 'error' when it was refused.
+    Refused ids do not stop the others from being moved.
+    """
+    order_ids = list(dict.fromkeys(order_ids))
+    allowed_from = sources(to_status)
+    results, moving = [], []
+
+    with transaction.atomic():
+        orders = Order.objects.select_for_update().only('id', *rollups.ROLLUP_FIELDS).in_bulk(order_ids)
+        for order_id in order_ids:
+            order = orders.get(order_id)
+            if order is None:
+                results.append({'id': order_id, 'ok': False, 'from_status': None, 'error': "Order not found."})
+            elif order.order_status not in allowed_from:
+                results.append({
+                    'id': order_id, 'ok': False, 'from_status': order.order_status,
+                    'error': f"Cannot move an order from {order.order_status} to {to_status}.",
+                })
+            else:
+                results.append({'id': order_id, 'ok': True, 'from_status': order.order_status})
+                moving.append(order)
+
+        if moving:
+            Order.objects.filter(pk__in=[order.pk for order in moving]).update(
+                order_status=to_status, updated_at=timezone.now(),
+            )
+
+            deltas = rollups.new_deltas()
+            from_statuses = {}
+            for order in moving:
+                rollups.add_delta(deltas, rollups.snapshot(order), -1)
+                from_statuses[order.pk] = order.order_status
+                order.order_status = to_status
+                rollups.add_delta(deltas, rollups.snapshot(order), 1)
+            rollups.apply(deltas)
+            events.record_bulk(moving, from_statuses, actor_id=actor_id, reason=reason)
+
+            if to_status == 'cancelled':
+                inventory.release([order.pk for order in moving])
+
+    return results
@@ -1,45 +1,260 @@
+import logging
+import time
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Sum
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from .models import Order
-from .serializers import OrderSerializer, DeliveryStatusSerializer, CancelOrderSerializer
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from Product.models import Product
+from inventory import services as inventory
+from Task1.conditional import ConditionalGetMixin
+from Task1.lean import LeanSerializer
+from Task1.sparse import SPARSE_PARAMETERS, COMPACT_PARAMETER, compact, sparse_queryset, wants_compact
+from Task1.streaming import created_between, stream_export
+from . import events, rollups, transitions
+from .idempotency import idempotent, IDEMPOTENCY_KEY_PARAMETER
+from .models import Order, SalesRollup
+from .serializers import (
+    OrderSerializer, DeliveryStatusSerializer, CancelOrderSerializer, PlaceCartSerializer,
+    SalesAnalyticsQuerySerializer, OrderExportQuerySerializer, OrderEventSerializer,
+    OrderEventFeedQuerySerializer, BulkStatusSerializer, OrderReadSerializer,
+)
+from .pagination import OrderCursorPagination
 
+logger = logging.getLogger(__name__)
 
-class OrderViewSet(viewsets.ViewSet):
+# A waiting request holds a worker thread here; longer waits belong on the
+# async feed (api/async/orders/events/), which waits on the event loop
+EVENT_FEED_MAX_SYNC_WAIT = 5
+
+ORDER_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('user', 'user_id'),
+    ('username', 'user__username'),
+    ('product', 'product_id'),
+    ('product_name', 'product__name'),
+    ('category', 'category_id'),
+    ('category_name', 'category__name'),
+    ('quantity', 'quantity'),
+    ('unit_price', 'unit_price'),
+    ('total_price', 'total_price'),
+    ('order_status', 'order_status'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+]
+
+
+def out_of_stock(error):
+    return Response(
+        {"detail": "Insufficient stock.", "available": error.available},
+        status=status.HTTP_409_CONFLICT,
+    )
+
+
+class OrderViewSet(ConditionalGetMixin, viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
         request_body=OrderSerializer,
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         responses={201: OrderSerializer}
     )
     @action(detail=False, methods=['post'], url_path='place-order')
+    @idempotent
     def place_order(self, request):
         serializer = OrderSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(user=request.user)
+            try:
+                with transaction.atomic():
+                    product = serializer.validated_data['product']
+                    order = serializer.save(user_id=request.user.pk, category_id=product.category_id)
+                    inventory.reserve_orders([order])
+            except inventory.OutOfStock as e:
+                return out_of_stock(e)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @swagger_auto_schema(
-        responses={200: OrderSerializer(many=True)}
+        request_body=PlaceCartSerializer,
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
+        responses={201: OrderSerializer(many=True)}
+    )
+    @action(detail=False, methods=['post'], url_path='place-cart')
+    @idempotent
+    def place_cart(self, request):
+        serializer = PlaceCartSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        lines = serializer.validated_data['lines']
+
+        # One query for every product in the cart instead of one per line
+        products = Product.objects.in_bulk({line['product'] for line in lines})
+        errors = {}
+        for index, line in enumerate(lines):
+            product = products.get(line['product'])
+            if product is None:
+                errors[index] = "Product not found."
+            elif not product.is_active:
+                errors[index] = "Product is not available."
+        if errors:
+            return Response({"lines": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        # bulk_create skips Order.save(), so snapshot the prices here from the
+        # products we already hold.
+        orders = []
+        for line in lines:
+            product = products[line['product']]
+            orders.append(Order(
+                user_id=request.user.pk,
+                product=product,
+                category_id=product.category_id,
+                quantity=line['quantity'],
+                unit_price=product.price,
+                total_price=product.price * line['quantity'],
+            ))
+        try:
+            with transaction.atomic():
+                Order.objects.bulk_create(orders)
+                rollups.record(orders)
+                events.record_bulk(orders, actor_id=request.user.pk)
+                inventory.reserve_orders(orders)
+        except inventory.OutOfStock as e:
+            return out_of_stock(e)
+        return Response(OrderSerializer(orders, many=True).data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        manual_parameters=SPARSE_PARAMETERS + [COMPACT_PARAMETER],
+        responses={200: OrderReadSerializer(many=True)}
     )
     @action(detail=False, methods=['get'], url_path='my-orders')
     def user_orders(self, request):
-        orders = Order.objects.filter(user=request.user)
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data)
+        orders = Order.objects.filter(user_id=request.user.pk)
+        context = {'request': request}
+
+        def page():
+            # Names come from the join, so a page costs one query however long the history is
+            paginator = OrderCursorPagination()
+            keep = [name.lstrip('-') for name in paginator.ordering]
+            queryset = sparse_queryset(
+                orders.select_related('product', 'category'), OrderReadSerializer(context=context), keep,
+            )
+            results = paginator.paginate_queryset(queryset, request, view=self)
+            data = OrderReadSerializer(results, many=True, context=context).data
+            response = paginator.get_paginated_response(data)
+            if wants_compact(request):
+                response.data = compact(response.data)
+            return response
+
+        # Product and category names are inlined, so renaming either is a change too
+        return self.conditional_response(request, orders, page, related=['product', 'category'], many=True)
 
     @swagger_auto_schema(
+        manual_parameters=SPARSE_PARAMETERS + [COMPACT_PARAMETER],
         responses={200: OrderSerializer(many=True)}
     )
     @action(detail=False, methods=['get'], url_path='admin-orders', permission_classes=[IsAdminUser])
     def admin_orders(self, request):
         orders = Order.objects.all()
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data)
+        context = {'request': request}
+
+        def page():
+            # One page of plain rows walked off the created_at index; the
+            # whole table goes through the streaming export instead
+            paginator = OrderCursorPagination()
+            lean = LeanSerializer(OrderSerializer(context=context))
+            rows = paginator.paginate_queryset(lean.values(orders, keep=paginator.ordering), request, view=self)
+            response = paginator.get_paginated_response(lean.to_representation(rows))
+            if wants_compact(request):
+                response.data = compact(response.data)
+            return response
+
+        return self.conditional_response(request, orders, page, many=True)
+
+    @swagger_auto_schema(
+        query_serializer=OrderExportQuerySerializer,
+        responses={200: 'CSV or NDJSON stream of orders'}
+    )
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsAdminUser])
+    def export(self, request):
+        params = OrderExportQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        filters = params.validated_data
+
+        orders = created_between(Order.objects.order_by('id'), filters.get('start'), filters.get('end'))
+        if filters.get('order_status'):
+            orders = orders.filter(order_status__in=filters['order_status'])
+        return stream_export(orders, ORDER_EXPORT_COLUMNS, filters['output'], 'orders')
+
+    @swagger_auto_schema(
+        query_serializer=SalesAnalyticsQuerySerializer,
+        responses={200: openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT))}
+    )
+    @action(detail=False, methods=['get'], url_path='analytics', permission_classes=[IsAdminUser])
+    def analytics(self, request):
+        params = SalesAnalyticsQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        filters = params.validated_data
+
+        # Served from the SalesRollup table, never from the order history
+        rollup = SalesRollup.objects.exclude(orders=0)
+        if 'start' in filters:
+            rollup = rollup.filter(day__gte=filters['start'])
+        if 'end' in filters:
+            rollup = rollup.filter(day__lte=filters['end'])
+        if 'order_status' in filters:
+            rollup = rollup.filter(order_status=filters['order_status'])
+
+        columns = []
+        for field in filters['group_by']:
+            columns.append(field)
+            if field in ('category', 'product'):
+                columns.append(f'{field}__name')
+
+        rows = (
+            rollup.values(*columns)
+            .annotate(order_count=Sum('orders'), units=Sum('units'), revenue=Sum('revenue'))
+            .order_by(*columns)
+        )
+        data = []
+        for row in rows:
+            item = {column.replace('__', '_'): row[column] for column in columns}
+            item['orders'] = row['order_count']
+            item['units'] = row['units']
+            item['revenue'] = str(Decimal(row['revenue']).quantize(Decimal('0.01')))
+            data.append(item)
+        return Response(data)
+
+    @swagger_auto_schema(
+        query_serializer=OrderEventFeedQuerySerializer,
+        responses={200: OrderEventSerializer(many=True)}
+    )
+    @action(detail=False, methods=['get'], url_path='events', permission_classes=[IsAdminUser])
+    def event_feed(self, request):
+        # Change feed: consumers pass the last id they saw as ?since= and
+        # optionally ?wait= seconds to long-poll instead of busy polling.
+        params = OrderEventFeedQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        filters = params.validated_data
+
+        feed = events.feed(filters['since'], filters.get('order'))
+        deadline = time.monotonic() + min(filters['wait'], EVENT_FEED_MAX_SYNC_WAIT)
+        while True:
+            batch = list(feed[:filters['limit']])
+            if batch or time.monotonic() >= deadline:
+                break
+            time.sleep(events.FEED_POLL_SECONDS)
+
+        return Response({
+            'events': OrderEventSerializer(batch, many=True).data,
+            'next_since': batch[-1].id if batch else filters['since'],
+        })
 
     @swagger_auto_schema(
         request_body=DeliveryStatusSerializer,
@@ -47,36 +262,74 @@ class OrderViewSet(viewsets.ViewSet):
     )
     @action(detail=True, methods=['patch'], url_path='update-delivery-status', permission_classes=[IsAdminUser])
     def update_delivery_status(self, request, pk=None):
-        try:
-            order = Order.objects.get(pk=pk)
-        except Order.DoesNotExist:
-            return Response({"detail": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+        with transaction.atomic():
+            # Locked so the transition is checked against the status it replaces
+            order = Order.objects.select_for_update().filter(pk=pk).first()
+            if order is None:
+                return Response({"detail": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = DeliveryStatusSerializer(order, data=request.data, partial=True)
-        if serializer.is_valid():
+            serializer = DeliveryStatusSerializer(order, data=request.data, partial=True)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            events.describe(order, actor_id=request.user.pk, reason=serializer.validated_data.get('reason'))
             serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.data)
+
+    @swagger_auto_schema(
+        request_body=BulkStatusSerializer,
+        responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)}
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-status', permission_classes=[IsAdminUser])
+    def bulk_status(self, request):
+        serializer = BulkStatusSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        results = transitions.bulk_transition(
+            data['ids'], data['order_status'], actor_id=request.user.pk, reason=data['reason'],
+        )
+        return Response({
+            'order_status': data['order_status'],
+            'updated': sum(result['ok'] for result in results),
+            'results': results,
+        })
 
     @swagger_auto_schema(
         request_body=CancelOrderSerializer,
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         responses={200: openapi.Schema(type=openapi.TYPE_OBJECT, properties={'detail': openapi.Schema(type=openapi.TYPE_STRING)} )}
     )
     @action(detail=True, methods=['post'], url_path='cancel')
+    @idempotent
     def cancel_order(self, request, pk=None):
-        try:
-            order = Order.objects.get(pk=pk)
-        except Order.DoesNotExist:
-            return Response({"detail": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+        with transaction.atomic():
+            # Locked so the transition is checked against the status it replaces
+            order = Order.objects.select_for_update().filter(pk=pk).first()
+            if order is None:
+                return Response({"detail": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        if not request.user.is_staff and order.user != request.user:
-            return Response({"detail": "You are not allowed to cancel this order."}, status=status.HTTP_403_FORBIDDEN)
+            if not request.user.is_staff and order.user_id != request.user.pk:
+                return Response({"detail": "You are not allowed to cancel this order."}, status=status.HTTP_403_FORBIDDEN)
+
+            serializer = CancelOrderSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            # Same table as the other status paths: a shipped or delivered
+            # order's stock is gone, so cancelling must not put it back
+            if 'cancelled' not in Order.ALLOWED_TRANSITIONS.get(order.order_status, ()):
+                return Response(
+                    {"detail": f"Cannot cancel an order that is {order.order_status}."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        serializer = CancelOrderSerializer(data=request.data)
-        if serializer.is_valid():
             reason = serializer.validated_data.get('reason')
-            print(f"Order {pk} cancelled by {request.user.username} for reason: {reason}")
             order.order_status = 'cancelled'
+            events.describe(order, actor_id=request.user.pk, reason=reason)
             order.save()
-            return Response({"detail": "Order cancelled successfully."})
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        logger.info(
+            "Order cancelled",
+            extra={'order_id': order.pk, 'actor': request.user.username, 'reason': reason},
+        )
+        return Response({"detail": "Order cancelled successfully."})
\ No newline at end of file
@@ -1,3 +1,11 @@
 from django.contrib import admin
+from .models import OutboxEmail
 
-# Register your models here.
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('id', 'to', 'subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('to', 'subject')
+    ordering = ('-created_at',)
+    list_per_page = 20
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
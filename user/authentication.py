@@ -0,0 +1,155 @@
+"""
+Stateless JWT authentication.
+
+Tokens issued by ClaimsTokenObtainPairSerializer carry the user id,
+username, is_staff/is_superuser and group names. ClaimsJWTAuthentication
+builds a ClaimsUser from those claims instead of loading the User row on
+every request. Claims are only as fresh as the token: a change to a user's
+staff flag or groups takes effect at the next refresh, and deactivation
+once the access token expires.
+
+Code that still needs the real row uses ``request.user.instance``. It is
+served from a per-process LRU cache with a TTL, which also covers tokens
+issued before the claims were added.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.http import JsonResponse
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+CLAIMS = ('username', 'is_staff', 'is_superuser', 'groups')
+
+
+def set_user_claims(token, user):
+    token['username'] = user.username
+    token['is_staff'] = user.is_staff
+    token['is_superuser'] = user.is_superuser
+    token['groups'] = sorted(user.groups.values_list('name', flat=True))
+    return token
+
+
+class UserCache:
+    """A small thread-safe LRU cache of User rows with a time-to-live."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+
+        user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            with self._lock:
+                self._entries[user_id] = (now + self.ttl, user)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.USER_CACHE_MAXSIZE, settings.USER_CACHE_TTL)
+
+
+class ClaimsUser(TokenUser):
+    """A request user backed by the access token's claims."""
+
+    @cached_property
+    def group_names(self):
+        return frozenset(self.token.get('groups', ()))
+
+    @property
+    def instance(self):
+        """The User row, from the in-process cache."""
+        return user_cache.get(self.id)
+
+    def __eq__(self, other):
+        if isinstance(other, User):
+            return self.id == other.pk
+        return super().__eq__(other)
+
+    __hash__ = TokenUser.__hash__
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if all(claim in validated_token for claim in CLAIMS):
+            return ClaimsUser(validated_token)
+
+        # Token issued before the claims were added
+        user = user_cache.get(validated_token[api_settings.USER_ID_CLAIM])
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+
+async def aauthenticate(request):
+    """
+    Authenticate a plain Django request for the async views, which bypass
+    DRF. Returns the user, or None when the request has no valid token.
+    """
+    auth = ClaimsJWTAuthentication()
+    header = auth.get_header(request)
+    if header is None:
+        return None
+    raw_token = auth.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    try:
+        token = auth.get_validated_token(raw_token)
+        if all(claim in token for claim in CLAIMS):
+            # No database access needed, so stay on the event loop
+            return auth.get_user(token)
+        return await sync_to_async(auth.get_user)(token)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
+
+def async_login_required(view):
+    """Async counterpart of IsAuthenticated for plain Django async views."""
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await aauthenticate(request)
+        if user is None:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=401, headers={'WWW-Authenticate': 'Bearer realm="api"'},
+            )
+        request.user = user
+        return await view(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count taken from
+    PASSWORD_PBKDF2_ITERATIONS. It keeps the stock algorithm name, so
+    existing hashes still verify; a hash made with a different count is
+    re-encoded with the configured one on the user's next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
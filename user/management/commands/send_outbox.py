@@ -0,0 +1,44 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from user import outbox
+
+
+def _deliver_chunk(emails):
+    try:
+        return outbox.deliver(emails)
+    finally:
+        # Each pool thread has its own DB connection; don't leak it
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails, batching each worker's share over one mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Number of sender threads.')
+        parser.add_argument('--batch-size', type=int, default=50, help='Emails sent per connection.')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new emails.')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when the outbox is empty.')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        batch_size = options['batch_size']
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                emails = outbox.claim_batch(batch_size * workers)
+                if emails:
+                    chunks = [emails[i:i + batch_size] for i in range(0, len(emails), batch_size)]
+                    results = list(pool.map(_deliver_chunk, chunks))
+                    sent = sum(r[0] for r in results)
+                    failed = sum(r[1] for r in results)
+                    self.stdout.write(f"Sent {sent} email(s), {failed} failed.")
+                    continue
+
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
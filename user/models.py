@@ -2,6 +2,7 @@ from django.db import models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import Group, User  # Ensure User is imported
+from django.utils import timezone
 
 @receiver(post_save, sender=User)
 def assign_group(sender, instance, created, **kwargs):
@@ -16,3 +17,33 @@ def assign_group(sender, instance, created, **kwargs):
         # instance.is_staff = True
         # instance.save()
 
+
+class OutboxEmail(models.Model):
+    """
+    An email waiting to be delivered by the send_outbox command, so request
+    handlers only pay for an INSERT instead of an SMTP round trip.
+    """
+    STATUS = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True, default='')
+    to = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {self.to} ({self.status})'
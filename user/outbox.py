@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from user.models import OutboxEmail
+
+
+def enqueue(subject, body, to, from_email=None):
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        to=to,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or '',
+    )
+
+
+def claim_batch(limit):
+    """
+    Lease up to ``limit`` due emails by pushing their next_attempt_at past
+    the lease window. Rows leased by another worker are skipped, and a
+    worker that dies mid-batch only delays its rows until the lease expires.
+    """
+    now = timezone.now()
+    due = OutboxEmail.objects.filter(status='pending', next_attempt_at__lte=now)
+    ids = list(due.order_by('next_attempt_at').values_list('pk', flat=True)[:limit])
+    if not ids:
+        return []
+
+    lease_until = now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+    due.filter(pk__in=ids).update(next_attempt_at=lease_until)
+    return list(OutboxEmail.objects.filter(pk__in=ids, next_attempt_at=lease_until))
+
+
+def retry_delay(attempts):
+    delay = settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.OUTBOX_RETRY_MAX_SECONDS))
+
+
+def deliver(emails):
+    """
+    Send ``emails`` over one reused mail connection and record the outcome.
+    Returns a (sent, failed) tuple of counts.
+    """
+    sent_ids = []
+    failures = []
+    try:
+        with get_connection() as connection:
+            for email in emails:
+                message = EmailMessage(
+                    email.subject, email.body, email.from_email or None, [email.to],
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as e:
+                    failures.append((email, e))
+                else:
+                    sent_ids.append(email.pk)
+    except Exception as e:
+        # Could not open (or cleanly close) the connection; retry everything
+        # that was not confirmed as sent.
+        failures = [(email, e) for email in emails if email.pk not in sent_ids]
+
+    if sent_ids:
+        OutboxEmail.objects.filter(pk__in=sent_ids).update(status='sent', sent_at=timezone.now())
+
+    for email, error in failures:
+        email.attempts += 1
+        email.last_error = str(error)
+        if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            email.status = 'failed'
+        else:
+            email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+        email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+    return len(sent_ids), len(failures)
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import AccessToken
+from user.authentication import set_user_claims
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -21,4 +24,22 @@ class UserSerializer(serializers.ModelSerializer):
 
             # user.is_staff = True  # set staff to True so they can log into admin panel
             # user.save()
-            # return user
\ No newline at end of file
+            # return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    # Embed what authorization needs, so requests don't have to load the user
+    @classmethod
+    def get_token(cls, user):
+        return set_user_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    # Re-read the claims on refresh so staff/group changes reach new tokens
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data['access'])
+        user = User.objects.filter(pk=access['user_id']).first()
+        if user is not None:
+            data['access'] = str(set_user_claims(access, user))
+        return data
@@ -1,7 +1,9 @@
+from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.core.mail import send_mail
-from django.conf import settings
+from user import outbox
+from user.authentication import user_cache
 
 
 @receiver(user_logged_in)
@@ -14,12 +16,14 @@ def send_welcome_email(sender, request, user, **kwargs):
         "Best regards,\n"
         "The E-Commerce Team"
     )
-    from_email = settings.DEFAULT_FROM_EMAIL
-    recipient_list = [user.email]
 
     if user.email:  # Ensure user has an email set
-        try:
-            send_mail(subject, message, from_email, recipient_list)
-            print(f"Welcome email sent to {user.email}")
-        except Exception as e:
-            print(f" Error sending email to {user.email}: {e}")
+        # Only queue the email here; `manage.py send_outbox` delivers it so
+        # the login response never waits on the mail server.
+        outbox.enqueue(subject, message, user.email)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
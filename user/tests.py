@@ -1,3 +1,111 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from . import outbox
+from .models import OutboxEmail
+
+
+# A low iteration count keeps the logins in these tests fast
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000, LOGIN_LOCKOUT_THRESHOLD=3)
+class LoginTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.get_or_create(name='is_admin')
+        Group.objects.get_or_create(name='is_not_admin')
+        cls.user = User.objects.create_user('customer', 'customer@example.com', 'pw')
+
+    def setUp(self):
+        # Throttle buckets and lockouts live in the cache
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self, username='customer', password='pw', ip='10.0.0.1'):
+        return self.client.post('/api/users/login/', {'username': username, 'password': password}, format='json', REMOTE_ADDR=ip)
+
+
+class LoginThrottleTests(LoginTestCase):
+    def test_lockout_after_repeated_failures(self):
+        self.assertEqual([self.login(password='bad').status_code for _ in range(3)], [401, 401, 401])
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+
+    def test_lockout_is_per_client_address(self):
+        for _ in range(3):
+            self.login(password='bad', ip='203.0.113.9')
+        self.assertEqual(self.login(ip='203.0.113.9').status_code, 429)
+        self.assertEqual(self.login(ip='10.0.0.2').status_code, 200)
+
+    def test_success_resets_failures(self):
+        self.login(password='bad')
+        self.login(password='bad')
+        self.assertEqual(self.login().status_code, 200)
+        self.login(password='bad')
+        self.assertEqual(self.login().status_code, 200)
+
+    @override_settings(LOGIN_IP_BUCKET=(3, 0.001))
+    def test_address_bucket_limits_bursts(self):
+        codes = [self.login(username=f'nobody{i}', password='x').status_code for i in range(3)]
+        self.assertEqual(codes, [401, 401, 401])
+        self.assertEqual(self.login().status_code, 429)
+        self.assertEqual(self.login(ip='10.0.0.2').status_code, 200)
+
+    def test_malformed_body_is_rejected(self):
+        self.assertEqual(self.client.post('/api/users/login/', [1, 2], format='json').status_code, 401)
+
+
+class LoginTests(LoginTestCase):
+    def test_login_upgrades_the_password_hash(self):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=500):
+            self.user.password = make_password('pw')
+        self.user.save()
+        self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password.split('$')[1], '1000')
+
+    def test_token_requests_do_not_load_the_user(self):
+        token = self.login().data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get('/api/orders/my-orders/').status_code, 200)
+        self.assertFalse([query for query in queries.captured_queries if 'auth_user' in query['sql']])
+
+    def test_refreshed_token_carries_current_claims(self):
+        tokens = self.login().data
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.post('/api/users/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(self.client.get('/api/orders/admin-orders/').status_code, 200)
+
+
+class OutboxTests(LoginTestCase):
+    # What one `manage.py send_outbox` pass does, without its sender threads
+    def send_outbox(self):
+        return outbox.deliver(outbox.claim_batch(50))
+
+    def test_login_queues_the_email_instead_of_sending(self):
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.filter(to='customer@example.com', status='pending').count(), 1)
+
+        self.assertEqual(self.send_outbox(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboxEmail.objects.get().status, 'sent')
+
+    def test_failed_delivery_is_retried_later(self):
+        email = OutboxEmail.objects.create(subject='s', body='b', to='customer@example.com')
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down')):
+            self.assertEqual(self.send_outbox(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('pending', 1))
+        self.assertGreater(email.next_attempt_at, email.created_at)
+        self.assertIn('down', email.last_error)
@@ -0,0 +1,105 @@
+"""
+Login throttling held in the Django cache, so every worker shares it.
+
+Two token buckets meter login attempts: one per client IP and one per
+(client IP, username). Separately, failed attempts are counted per
+(client IP, username); once they reach LOGIN_LOCKOUT_THRESHOLD that pair
+is locked for LOGIN_LOCKOUT_SECONDS. Nothing is keyed on the username
+alone, so a stranger sending bad passwords for someone else's account
+locks out only their own address, not the account owner. All of these checks run before the password is
+hashed, so a credential-stuffing burst is turned away for the price of a
+few cache reads instead of a PBKDF2 run each.
+
+Bucket updates are read-modify-write on the cache and not atomic: a burst
+of simultaneous requests can get slightly more than its share. That is
+acceptable for throttling; the lockout counter uses the atomic incr.
+"""
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_cache():
+    return caches[settings.LOGIN_THROTTLE_CACHE_ALIAS]
+
+
+def _key(*parts):
+    # Usernames are user input: hash them into a cache-safe key
+    return 'login:' + ':'.join(parts[:-1] + (hashlib.md5(parts[-1].encode()).hexdigest(),))
+
+
+class TokenBucket:
+    """``capacity`` attempts in a burst, refilled at ``rate`` attempts per second."""
+
+    def __init__(self, scope, capacity, rate):
+        self.scope = scope
+        self.capacity = capacity
+        self.rate = rate
+
+    def consume(self, ident, now=None):
+        """Take one token for ``ident``. Returns 0 if allowed, else the seconds to wait."""
+        cache = get_cache()
+        key = _key('bucket', self.scope, ident)
+        now = time.time() if now is None else now
+        state = cache.get(key)
+        if state is None:
+            tokens = self.capacity
+        else:
+            tokens, updated = state
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+
+        wait = 0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        # Kept until it would have refilled completely, then a missing key means full
+        cache.set(key, (tokens, now), math.ceil(self.capacity / self.rate) + 1)
+        return wait
+
+
+class LoginThrottle:
+    """The throttling decisions for one login request."""
+
+    def __init__(self, ip, username):
+        self.ip = ip or 'unknown'
+        self.username = str(username or '').strip().lower()
+
+    def check(self):
+        """Seconds the client must wait before trying again, or 0 to go ahead."""
+        cache = get_cache()
+        if self.username:
+            locked_until = cache.get(_key('locked', self.ip, self.username))
+            if locked_until is not None and locked_until > time.time():
+                return locked_until - time.time()
+
+        ip_bucket = TokenBucket('ip', *settings.LOGIN_IP_BUCKET)
+        wait = ip_bucket.consume(self.ip)
+        if not wait and self.username:
+            wait = TokenBucket(f'username:{self.ip}', *settings.LOGIN_USERNAME_BUCKET).consume(self.username)
+        return wait
+
+    def failed(self):
+        if not self.username:
+            return
+        cache = get_cache()
+        key = _key('failures', self.ip, self.username)
+        # The window starts at the first failure and is not extended by later ones
+        if cache.add(key, 1, settings.LOGIN_LOCKOUT_SECONDS):
+            failures = 1
+        else:
+            try:
+                failures = cache.incr(key)
+            except ValueError:  # expired in between
+                cache.add(key, 1, settings.LOGIN_LOCKOUT_SECONDS)
+                failures = 1
+        if failures >= settings.LOGIN_LOCKOUT_THRESHOLD:
+            cache.set(_key('locked', self.ip, self.username), time.time() + settings.LOGIN_LOCKOUT_SECONDS, settings.LOGIN_LOCKOUT_SECONDS)
+            cache.delete(key)
+
+    def succeeded(self):
+        if self.username:
+            get_cache().delete(_key('failures', self.ip, self.username))
@@ -1,3 +1,4 @@
+import math
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
@@ -6,18 +7,32 @@ from django.contrib.auth import authenticate
 from django.contrib.auth.signals import user_logged_in
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from user.serializers import UserSerializer
+from user.throttling import LoginThrottle
 
 
 class MyTokenObtainPairView(TokenObtainPairView):
     #pass
 
     def post(self, request, *args, **kwargs):
+        # Throttled before the password is hashed, so refused attempts cost no hashing
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        throttle = LoginThrottle(request.META.get('REMOTE_ADDR'), username)
+        wait = throttle.check()
+        if wait:
+            retry_after = math.ceil(wait)
+            return Response(
+                {"detail": f"Too many login attempts. Try again in {retry_after} seconds."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': str(retry_after)},
+            )
+
         serializer = self.get_serializer(data=request.data)
         try:
             serializer.is_valid(raise_exception=True)
         except Exception as e:
+            throttle.failed()
             return Response({"detail": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
 
+        throttle.succeeded()
         user = serializer.user
 
         if user: